@@ -0,0 +1,357 @@
+import asyncio
+import inspect
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.shortcuts import aget_object_or_404
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.caching import acached_response, post_scope
+from api.changes import ExpiredCursor, latest_cursor
+from api.loaders import aload_liked_post_ids
+from api.models import Member, Post, Comment
+from api.pagination import (
+    InvalidCursor,
+    KeysetPaginator,
+    aapproximate_count,
+    cursor_link,
+)
+from api.serializers import (
+    PostSerializer,
+    CommentSerializer,
+    ProfileSerializer,
+    InvalidFields,
+    is_selected,
+)
+from api.views import (
+    MeView,
+    PostListView,
+    PostDetailView,
+    CommentListView,
+    ChangeListView,
+    ProfileDetailView,
+    field_selection,
+    get_page_size,
+    is_streaming,
+    serializer_context,
+    with_members,
+)
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines, for read views served over ASGI.
+
+    DRF only dispatches synchronously, so this runs authentication,
+    permissions and throttling (APIView.initial) through sync_to_async and
+    then awaits the handler. Handlers query with the async ORM and must hand
+    serializers fully loaded data, since lazy relation access is not allowed
+    inside the event loop.
+    """
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def run_sync(self, handler, *args):
+        """
+        Run a sync handler in a worker thread. Streamed responses keep
+        streaming: their rows are pulled from the same thread chunk by chunk
+        instead of being buffered by the ASGI handler.
+        """
+        response = await sync_to_async(handler)(*args)
+        if response.streaming and not response.is_async:
+            response.streaming_content = _aiterate(iter(response.streaming_content))
+        return response
+
+
+async def _aiterate(iterator):
+    done = object()
+    while (chunk := await sync_to_async(next)(iterator, done)) is not done:
+        yield chunk
+
+
+class AsyncMeView(AsyncAPIView, MeView):
+    """
+    GET /api/auth/me/ - Get current authenticated user
+    """
+    async def get(self, request):
+        # The member was loaded by authentication; serializing it is pure
+        return super().get(request)
+
+
+class AsyncPostListView(AsyncAPIView, PostListView):
+    """
+    GET /api/posts/ - Get paginated list of posts
+
+    Cursor pages are read with the async ORM. Legacy `page` mode and
+    `stream=1` are served by the sync implementation in a worker thread.
+    """
+    async def get(self, request):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        if 'cursor' not in request.GET or is_streaming(request):
+            return await self.run_sync(super().get, request)
+
+        return await acached_response(
+            request,
+            ['posts'],
+            lambda: self.aget_cursor_page(request)
+        )
+
+    async def aget_cursor_page(self, request):
+        try:
+            fields = field_selection(request, PostSerializer)
+        except InvalidFields as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            page_size = get_page_size(request, 20)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid page_size'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        posts = PostSerializer.select_columns(Post.objects.all().select_related('author'), fields)
+
+        try:
+            page = await KeysetPaginator(posts, page_size).apage(
+                request.GET.get('cursor') or None
+            )
+        except InvalidCursor:
+            return Response(
+                {'error': 'Invalid cursor'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        count_mode = request.GET.get('count')
+        if count_mode == 'exact':
+            count = await posts.acount()
+        elif count_mode == 'approx':
+            count = await aapproximate_count(posts)
+        else:
+            count = None
+
+        liked_post_ids = set()
+        if is_selected(fields, 'is_liked'):
+            liked_post_ids = await aload_liked_post_ids(
+                request.user,
+                [post.id for post in page.object_list]
+            )
+        context = serializer_context(request, liked_post_ids=liked_post_ids, fields=fields)
+        serializer = PostSerializer(page.object_list, many=True, context=context)
+        return Response(with_members({
+            'count': count,
+            'next': cursor_link(request, page.next_cursor),
+            'previous': cursor_link(request, page.previous_cursor),
+            'results': serializer.data
+        }, context), status=status.HTTP_200_OK)
+
+
+class AsyncPostDetailView(AsyncAPIView, PostDetailView):
+    """
+    GET /api/posts/{id}/ - Get a single post
+
+    Cached, and answers If-None-Match with 304 when the post is unchanged.
+    """
+    async def get(self, request, id):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        return await acached_response(
+            request,
+            [post_scope(id), 'members'],
+            lambda: self.aget_post(request, id)
+        )
+
+    async def aget_post(self, request, id):
+        try:
+            fields = field_selection(request, PostSerializer)
+        except InvalidFields as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        post = await aget_object_or_404(
+            PostSerializer.select_columns(Post.objects.select_related('author'), fields),
+            id=id
+        )
+        liked_post_ids = set()
+        if is_selected(fields, 'is_liked'):
+            liked_post_ids = await aload_liked_post_ids(request.user, [post.id])
+        serializer = PostSerializer(
+            post,
+            context={'request': request, 'liked_post_ids': liked_post_ids, 'fields': fields}
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class AsyncCommentListView(AsyncAPIView, CommentListView):
+    """
+    GET /api/posts/{post_id}/comments/ - Get cursor-paginated comments for a post
+
+    `stream=1` is served by the sync implementation in a worker thread.
+    """
+    async def get(self, request, post_id):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        if is_streaming(request):
+            return await self.run_sync(super().get, request, post_id)
+
+        try:
+            fields = field_selection(request, CommentSerializer)
+        except InvalidFields as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        post = await aget_object_or_404(Post.objects.only('id'), id=post_id)
+        try:
+            page_size = get_page_size(request, 50)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid page_size'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        comments = CommentSerializer.select_columns(
+            Comment.objects.filter(post=post).select_related('author'),
+            fields
+        )
+
+        try:
+            page = await KeysetPaginator(comments, page_size, descending=False).apage(
+                request.GET.get('cursor') or None
+            )
+        except InvalidCursor:
+            return Response(
+                {'error': 'Invalid cursor'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        context = serializer_context(request, fields=fields)
+        serializer = CommentSerializer(page.object_list, many=True, context=context)
+        return Response(with_members({
+            'next': cursor_link(request, page.next_cursor),
+            'previous': cursor_link(request, page.previous_cursor),
+            'results': serializer.data
+        }, context), status=status.HTTP_200_OK)
+
+
+class AsyncProfileDetailView(AsyncAPIView, ProfileDetailView):
+    """
+    GET /api/profile/{id}/ - Get user profile with the first page of posts
+    """
+    async def get(self, request, id):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        try:
+            fields = field_selection(request, ProfileSerializer)
+        except InvalidFields as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        member = await aget_object_or_404(
+            ProfileSerializer.select_columns(Member.objects.all(), fields),
+            id=id
+        )
+        context = serializer_context(request, fields=fields)
+        if is_selected(fields, 'posts') or is_selected(fields, 'posts_next'):
+            posts_fields = ProfileSerializer.posts_selection(fields)
+            page = await KeysetPaginator(
+                PostSerializer.select_columns(member.posts.all(), posts_fields),
+                settings.PROFILE_POSTS_PAGE_SIZE
+            ).apage()
+            context['posts_page'] = page
+            context['liked_post_ids'] = set()
+            if is_selected(posts_fields, 'is_liked'):
+                context['liked_post_ids'] = await aload_liked_post_ids(
+                    request.user,
+                    [post.id for post in page.object_list]
+                )
+        serializer = ProfileSerializer(member, context=context)
+        return Response(with_members(serializer.data, context), status=status.HTTP_200_OK)
+
+
+class AsyncChangeListView(AsyncAPIView, ChangeListView):
+    """
+    GET /api/changes/?since={cursor}&wait={seconds} - Post feed changes since a cursor
+
+    Long polls wait on the event loop, so an idle client holds no thread.
+    """
+    async def get(self, request):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+
+        try:
+            since, wait = self.get_params(request)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid since or wait'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        changes_response = sync_to_async(self.changes_response)
+        if since is None:
+            return await changes_response(request, await sync_to_async(latest_cursor)(), [])
+
+        read = sync_to_async(self.read)
+        deadline = time.monotonic() + wait
+        # Time spent asleep is reported as wait in Server-Timing and is not
+        # counted towards slow request logging
+        request._request.wait_duration = 0
+        try:
+            rows = await read(since)
+            while not rows and time.monotonic() < deadline:
+                slept_at = time.monotonic()
+                await asyncio.sleep(min(settings.CHANGES_POLL_INTERVAL, deadline - slept_at))
+                request._request.wait_duration += time.monotonic() - slept_at
+                rows = await read(since)
+        except ExpiredCursor:
+            return self.expired_response()
+        return await changes_response(request, since, rows)
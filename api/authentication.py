@@ -0,0 +1,126 @@
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core import signing
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from api.caching import get_versions, member_scope
+from api.models import Member
+
+logger = logging.getLogger(__name__)
+
+SESSION_COOKIE_NAME = 'session_id'
+SESSION_TOKEN_SALT = 'api.session'
+
+
+def issue_session_token(member):
+    """Return a signed, timestamped session token for member"""
+    return signing.TimestampSigner(salt=SESSION_TOKEN_SALT).sign(str(member.id))
+
+
+def read_session_token(token):
+    """Return the member id carried by a valid, unexpired session token"""
+    value = signing.TimestampSigner(salt=SESSION_TOKEN_SALT).unsign(
+        token,
+        max_age=settings.SESSION_TOKEN_MAX_AGE
+    )
+    return int(value)
+
+
+class MemberCache:
+    """
+    Bounded per-process LRU cache of members keyed by id.
+
+    Each entry remembers the version of the member's scope in the shared
+    cache (api.caching.member_scope) it was loaded under. Saving or deleting
+    a member bumps that scope, so every worker drops its copy on the next
+    lookup. Entries also expire after `ttl` seconds.
+    """
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, member_id, version):
+        with self._lock:
+            entry = self._entries.get(member_id)
+            if entry is None:
+                return None
+            member, cached_version, expires_at = entry
+            if cached_version != version or expires_at < time.monotonic():
+                del self._entries[member_id]
+                return None
+            self._entries.move_to_end(member_id)
+        return copy.copy(member)
+
+    def set(self, member, version):
+        with self._lock:
+            self._entries[member.id] = (copy.copy(member), version, time.monotonic() + self.ttl)
+            self._entries.move_to_end(member.id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, member_id):
+        with self._lock:
+            self._entries.pop(member_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+member_cache = MemberCache(
+    settings.AUTH_MEMBER_CACHE_SIZE,
+    settings.AUTH_MEMBER_CACHE_TTL
+)
+
+
+class CookieAuthentication(BaseAuthentication):
+    """
+    Custom authentication class that authenticates users via HttpOnly cookie.
+    Cookie name: 'session_id', value: signed session token
+
+    Members are served from a per-process cache, so most requests
+    authenticate with one shared-cache read for the member's version instead
+    of a database query. The time spent is recorded
+    on the underlying HttpRequest as `auth_duration` (seconds).
+    """
+    def authenticate(self, request):
+        token = request.COOKIES.get(SESSION_COOKIE_NAME)
+
+        if not token:
+            return None
+
+        started = time.perf_counter()
+        try:
+            return (self.get_member(token), None)
+        finally:
+            request._request.auth_duration = time.perf_counter() - started
+            logger.debug('auth took %.3fms', request._request.auth_duration * 1000)
+
+    def get_member(self, token):
+        try:
+            member_id = read_session_token(token)
+        except (signing.BadSignature, ValueError):
+            raise AuthenticationFailed('Invalid session')
+
+        # Read before loading the member, so a save racing with the load
+        # leaves an entry under the old version that the next lookup drops
+        [version] = get_versions(member_scope(member_id))
+        member = member_cache.get(member_id, version)
+        if member is not None:
+            return member
+
+        try:
+            member = Member.objects.get(id=member_id)
+        except Member.DoesNotExist:
+            raise AuthenticationFailed('Invalid session')
+
+        member_cache.set(member, version)
+        return member
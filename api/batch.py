@@ -0,0 +1,90 @@
+import inspect
+import json
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+BATCH_PREFIX = '/api/'
+
+# Request headers that describe the outer batch request rather than the
+# sub-request, or would turn a sub-request into a conditional one
+DROPPED_META = ('CONTENT_LENGTH', 'CONTENT_TYPE', 'HTTP_IF_NONE_MATCH')
+
+
+class InvalidSubrequest(ValueError):
+    pass
+
+
+def validate_subrequest(item):
+    """
+    Check the shape of one entry of a batch body and raise InvalidSubrequest
+    if it is not an object with a string `path`, an optional `method` of
+    GET and no `body`, since only GET sub-requests are run.
+    """
+    if not isinstance(item, dict):
+        raise InvalidSubrequest('Each sub-request must be an object')
+    if not isinstance(item.get('path'), str):
+        raise InvalidSubrequest('path must be a string')
+    method = item.get('method', 'GET')
+    if not isinstance(method, str) or method.upper() != 'GET':
+        raise InvalidSubrequest('method must be GET')
+    if item.get('body') is not None:
+        raise InvalidSubrequest('GET sub-requests cannot have a body')
+
+
+def run_subrequest(request, path):
+    """
+    Run GET `path` through the URL resolver on behalf of the member who made
+    the batch request and return (status, body).
+
+    The sub-request reuses the outer request's authenticated member instead
+    of reading the session cookie again, and runs on the same thread and
+    database connection. Paths must point at the API and may not nest
+    another batch.
+    """
+    parts = urlsplit(path)
+    if parts.scheme or parts.netloc or not parts.path.startswith(BATCH_PREFIX):
+        raise InvalidSubrequest(f'Path must start with {BATCH_PREFIX}')
+
+    try:
+        match = resolve(parts.path)
+    except Resolver404:
+        return 404, {'error': 'Not found'}
+    if match.url_name == 'batch':
+        raise InvalidSubrequest('Batch requests cannot be nested')
+
+    outer = request._request
+    sub = HttpRequest()
+    sub.method = 'GET'
+    sub.path = sub.path_info = parts.path
+    sub.GET = QueryDict(parts.query)
+    sub.COOKIES = outer.COOKIES
+    sub.META = {key: value for key, value in outer.META.items() if key not in DROPPED_META}
+    sub.META.update(REQUEST_METHOD='GET', PATH_INFO=parts.path, QUERY_STRING=parts.query)
+    sub.resolver_match = match
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+
+    response = match.func(sub, *match.args, **match.kwargs)
+    if inspect.isawaitable(response):
+        response = async_to_sync(_await)(response)
+    if response.streaming:
+        if response.is_async:
+            # Async views stream through an async iterator
+            content = async_to_sync(_join)(response.streaming_content)
+        else:
+            content = b''.join(response.streaming_content)
+        return response.status_code, json.loads(content)
+    if hasattr(response, 'data'):
+        return response.status_code, response.data
+    return response.status_code, json.loads(response.content) if response.content else None
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+async def _join(chunks):
+    return b''.join([chunk async for chunk in chunks])
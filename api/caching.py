@@ -0,0 +1,141 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = 'api:version:{}'
+RESPONSE_KEY = 'api:response:{}'
+
+# For commands that run against a throwaway test database, whose ids would
+# otherwise collide with entries left in the shared cache
+DISABLED_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+}
+
+
+def bump(*scopes):
+    """
+    Invalidate every cached response that depends on any of scopes.
+
+    Versions are replaced with a fresh random token rather than incremented,
+    so two writers racing on a non-atomic cache backend can never end up
+    re-publishing an old version. The bump runs once the surrounding
+    transaction commits.
+    """
+    def replace_versions():
+        cache.set_many(
+            {VERSION_KEY.format(scope): uuid.uuid4().hex for scope in scopes},
+            timeout=None
+        )
+    transaction.on_commit(replace_versions)
+
+
+def get_versions(*scopes):
+    """Return the current version token of each scope, creating missing ones"""
+    keys = [VERSION_KEY.format(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            version = uuid.uuid4().hex
+            cache.add(key, version, timeout=None)
+            found[key] = cache.get(key, version)
+    return [found[key] for key in keys]
+
+
+def post_scope(post_id):
+    return f'post:{post_id}'
+
+
+def member_scope(member_id):
+    return f'member:{member_id}'
+
+
+def cached_response(request, scopes, build):
+    """
+    Serve a read endpoint from the shared response cache with ETag support.
+
+    The key covers the full URL, the viewer (for is_liked and friends), the
+    Accept header and the versions of every scope the response depends on.
+    Writers bump those scopes, so a key never serves stale data. The ETag is
+    derived from the same material: If-None-Match is answered with 304 from
+    the cached versions alone, without touching the database.
+    """
+    if request.GET.get('stream') == '1':
+        return build()
+
+    digest = _digest(request, get_versions(*scopes))
+    if _is_not_modified(request, digest):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        data = cache.get(RESPONSE_KEY.format(digest))
+        if data is not None:
+            response = Response(data, status=status.HTTP_200_OK)
+        else:
+            response = build()
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(
+                    RESPONSE_KEY.format(digest),
+                    response.data,
+                    timeout=settings.API_RESPONSE_CACHE_TIMEOUT
+                )
+    return _with_validators(response, digest)
+
+
+async def aget_versions(*scopes):
+    """Async version of get_versions()"""
+    keys = [VERSION_KEY.format(scope) for scope in scopes]
+    found = await cache.aget_many(keys)
+    for key in keys:
+        if key not in found:
+            version = uuid.uuid4().hex
+            await cache.aadd(key, version, timeout=None)
+            found[key] = await cache.aget(key, version)
+    return [found[key] for key in keys]
+
+
+async def acached_response(request, scopes, build):
+    """Async version of cached_response(); build is a coroutine function"""
+    if request.GET.get('stream') == '1':
+        return await build()
+
+    digest = _digest(request, await aget_versions(*scopes))
+    if _is_not_modified(request, digest):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        data = await cache.aget(RESPONSE_KEY.format(digest))
+        if data is not None:
+            response = Response(data, status=status.HTTP_200_OK)
+        else:
+            response = await build()
+            if response.status_code == status.HTTP_200_OK:
+                await cache.aset(
+                    RESPONSE_KEY.format(digest),
+                    response.data,
+                    timeout=settings.API_RESPONSE_CACHE_TIMEOUT
+                )
+    return _with_validators(response, digest)
+
+
+def _digest(request, versions):
+    material = '|'.join([
+        request.get_full_path(),
+        str(getattr(request.user, 'id', '')),
+        request.META.get('HTTP_ACCEPT', ''),
+        *versions,
+    ])
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def _is_not_modified(request, digest):
+    return f'"{digest}"' in request.META.get('HTTP_IF_NONE_MATCH', '')
+
+
+def _with_validators(response, digest):
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        response['ETag'] = f'"{digest}"'
+        response['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,68 @@
+from django.conf import settings
+
+from api.models import Change
+
+
+class ExpiredCursor(Exception):
+    """The change log no longer holds every entry after the cursor"""
+
+
+def record_change(kind, post_id):
+    """Append a change to the log; call inside the write's transaction"""
+    Change.objects.create(kind=kind, post_id=post_id)
+
+
+def record_changes(kind, post_ids):
+    """Append one change per post id to the log, in a single insert"""
+    Change.objects.bulk_create([Change(kind=kind, post_id=post_id) for post_id in post_ids])
+
+
+def latest_cursor():
+    """Return the id of the newest change, or 0 if the log is empty"""
+    return Change.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def read_changes(since, limit):
+    """
+    Return up to limit (id, kind, post_id) tuples after cursor since, read as
+    a single primary key range scan.
+
+    Ids have no gaps except where the log was purged, so a first entry past
+    since + 1 means the client missed entries and must reload. So does a
+    cursor past the newest entry, which no longer belongs to this log (e.g.
+    after the database was reset).
+    """
+    rows = list(
+        Change.objects.filter(id__gt=since)
+        .order_by('id')
+        .values_list('id', 'kind', 'post_id')[:limit]
+    )
+    if rows and rows[0][0] != since + 1:
+        raise ExpiredCursor()
+    if not rows and since > latest_cursor():
+        raise ExpiredCursor()
+    return rows
+
+
+def summarize_changes(rows):
+    """
+    Collapse change rows into (created, updated, deleted) post id lists,
+    newest first. A post appears in at most one list: created or deleted
+    win over updated, and deleted wins over created.
+    """
+    created, updated, deleted = {}, {}, {}
+    for _, kind, post_id in reversed(rows):
+        if kind == Change.POST_CREATED:
+            created[post_id] = None
+        elif kind == Change.POST_DELETED:
+            deleted[post_id] = None
+        else:
+            updated[post_id] = None
+    updated = [post_id for post_id in updated if post_id not in deleted and post_id not in created]
+    created = [post_id for post_id in created if post_id not in deleted]
+    return created, updated, list(deleted)
+
+
+def trim_change_log():
+    """Drop all but the newest CHANGE_LOG_MAX_ENTRIES entries"""
+    Change.objects.filter(id__lte=latest_cursor() - settings.CHANGE_LOG_MAX_ENTRIES).delete()
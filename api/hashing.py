@@ -0,0 +1,60 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingPoolBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many sign-in requests in progress, please retry shortly.'
+    default_code = 'hashing_pool_busy'
+
+
+class HashingPool:
+    """
+    Run password hashing on at most `workers` threads per process.
+
+    PBKDF2 releases the GIL, so without a bound every request thread could
+    be hashing at once and starve feed requests of CPU. Callers beyond
+    `workers` running plus `queue` waiting are rejected straight away
+    instead of piling up behind the pool.
+    """
+    def __init__(self, workers, queue):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(workers + queue)
+
+    def run(self, function, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolBusy()
+        try:
+            return self._executor.submit(function, *args).result()
+        finally:
+            self._slots.release()
+
+
+_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+
+
+def _process_pool():
+    """Return this process's pool, creating a new one after a fork"""
+    global _pool, _pool_pid
+    with _lock:
+        if _pool_pid != os.getpid():
+            _pool = HashingPool(settings.PASSWORD_HASHING_WORKERS, settings.PASSWORD_HASHING_QUEUE)
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def run_hashing(function, *args):
+    """
+    Call function(*args) on the hashing pool and return its result, or run
+    it inline when PASSWORD_HASHING_WORKERS is 0
+    """
+    if not settings.PASSWORD_HASHING_WORKERS:
+        return function(*args)
+    return _process_pool().run(function, *args)
@@ -0,0 +1,116 @@
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+def task(function):
+    """Register function as a job task under its own name"""
+    TASKS[function.__name__] = function
+    return function
+
+
+def enqueue(task_name, delay=0, max_attempts=None, **payload):
+    """
+    Queue task_name(**payload) to run in the background and return the job.
+
+    The job row is written in the caller's transaction, so it exists exactly
+    when the work that needs it was committed. With JOB_QUEUE_INLINE the task
+    runs in-process once that transaction commits instead, for development
+    servers without a worker.
+    """
+    if task_name not in TASKS:
+        raise ValueError(f'Unknown task: {task_name}')
+    if settings.JOB_QUEUE_INLINE:
+        transaction.on_commit(lambda: TASKS[task_name](**payload))
+        return None
+    return Job.objects.create(
+        task=task_name,
+        payload=payload,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claim(lease_seconds=None):
+    """
+    Atomically claim the next due job and return it, or None.
+
+    A single UPDATE ... RETURNING picks the oldest due job, whether queued
+    or running with an expired lease, marks it running and moves its run_at
+    to the end of the lease, so two workers can never claim the same job.
+    """
+    now = timezone.now()
+    lease_end = now + timedelta(seconds=lease_seconds or settings.JOB_LEASE_SECONDS)
+    table = connection.ops.quote_name(Job._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {table} SET status = %s, attempts = attempts + 1, run_at = %s '
+            f'WHERE id = ('
+            f'SELECT id FROM {table} WHERE status IN (%s, %s) AND run_at <= %s '
+            f'ORDER BY run_at LIMIT 1'
+            f') RETURNING id, task, payload, attempts, max_attempts',
+            [
+                Job.RUNNING,
+                connection.ops.adapt_datetimefield_value(lease_end),
+                Job.QUEUED,
+                Job.RUNNING,
+                connection.ops.adapt_datetimefield_value(now),
+            ]
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    job_id, task_name, payload, attempts, max_attempts = row
+    return Job(
+        id=job_id,
+        task=task_name,
+        payload=Job._meta.get_field('payload').from_db_value(payload, None, connection),
+        status=Job.RUNNING,
+        attempts=attempts,
+        max_attempts=max_attempts,
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter, capped at JOB_RETRY_MAX_DELAY"""
+    delay = min(settings.JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_DELAY)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def run(job):
+    """
+    Run a claimed job. Finished jobs are deleted; failed ones are queued again
+    after a backoff, or kept as failed once max_attempts is used up. Returns
+    whether the task succeeded.
+    """
+    current = Job.objects.filter(id=job.id, status=Job.RUNNING, attempts=job.attempts)
+    try:
+        if job.attempts > job.max_attempts:
+            raise RuntimeError('Lease expired on every attempt')
+        TASKS[job.task](**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            logger.error('Job %s (%s) failed permanently:\n%s', job.id, job.task, error)
+            current.update(status=Job.FAILED, last_error=error)
+        else:
+            logger.warning('Job %s (%s) failed, will retry:\n%s', job.id, job.task, error)
+            current.update(
+                status=Job.QUEUED,
+                run_at=timezone.now() + timedelta(seconds=retry_delay(job.attempts)),
+                last_error=error,
+            )
+        return False
+    current.delete()
+    return True
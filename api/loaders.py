@@ -0,0 +1,33 @@
+from api.models import Like
+
+
+def load_liked_post_ids(member, post_ids):
+    """
+    Return the subset of post_ids liked by member, fetched in a single
+    IN (...) query.
+    """
+    if not member or not getattr(member, 'is_authenticated', False):
+        return set()
+    post_ids = list(post_ids)
+    if not post_ids:
+        return set()
+    return set(
+        Like.objects.filter(member=member, post_id__in=post_ids)
+        .order_by()
+        .values_list('post_id', flat=True)
+    )
+
+
+async def aload_liked_post_ids(member, post_ids):
+    """Async version of load_liked_post_ids()"""
+    if not member or not getattr(member, 'is_authenticated', False):
+        return set()
+    post_ids = list(post_ids)
+    if not post_ids:
+        return set()
+    return {
+        post_id async for post_id in
+        Like.objects.filter(member=member, post_id__in=post_ids)
+        .order_by()
+        .values_list('post_id', flat=True)
+    }
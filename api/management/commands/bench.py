@@ -0,0 +1,258 @@
+import io
+import itertools
+import json
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+
+from api.authentication import SESSION_COOKIE_NAME, issue_session_token
+from api.caching import DISABLED_CACHES
+from api.management.commands.explain_queries import SAMPLE_REQUESTS, encode_body
+from api.models import Member, Post, Like, Comment, Follow, Change
+from api.timeline import fan_out_post
+from api.urls import urlpatterns
+
+TOPICS = ['coffee', 'music', 'travel', 'football', 'books', 'cooking', 'python', 'cats']
+
+# Statements issued by the benchmark's own rollback wrapper and the views'
+# atomic blocks; they are not counted as queries
+TRANSACTION_CONTROL = ('SAVEPOINT', 'RELEASE', 'ROLLBACK', 'BEGIN', 'COMMIT')
+
+
+class Zipf:
+    """Draw items with probability proportional to 1 / rank ** exponent"""
+    def __init__(self, items, exponent, rng):
+        self.items = list(items)
+        self.cum_weights = list(itertools.accumulate(
+            1 / rank ** exponent for rank in range(1, len(self.items) + 1)
+        ))
+        self.rng = rng
+
+    def draw(self):
+        return self.rng.choices(self.items, cum_weights=self.cum_weights)[0]
+
+
+class Command(BaseCommand):
+    """Seed a synthetic social graph and benchmark every API route"""
+    help = (
+        'Seed a throwaway database with a Zipf-distributed social graph, '
+        'request every route in api/urls.py through the test client and '
+        'report p50/p95/p99 latency, queries per request and peak memory '
+        'as JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument('--likes', type=int, default=20000)
+        parser.add_argument('--comments', type=int, default=5000)
+        parser.add_argument('--follows', type=int, default=20, help='Followees per member')
+        parser.add_argument('--zipf', type=float, default=1.1, help='Zipf exponent for popularity')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per route')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--routes', help='Comma-separated route names to run (default: all)')
+
+    def handle(self, *args, **options):
+        covered = {name for name, *_ in SAMPLE_REQUESTS}
+        missing = [pattern.name for pattern in urlpatterns if pattern.name not in covered]
+        if missing:
+            raise CommandError(f'No sample request for route(s): {", ".join(missing)}')
+        if options['members'] < 2 or options['posts'] < 1 or options['iterations'] < 2:
+            raise CommandError('Need at least 2 members, 1 post and 2 iterations')
+
+        selected = set(options['routes'].split(',')) if options['routes'] else covered
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with tempfile.TemporaryDirectory() as media_root, override_settings(
+                CACHES=DISABLED_CACHES, METRICS_ENABLED=False, MEDIA_ROOT=media_root
+            ):
+                started = time.perf_counter()
+                viewer, fixtures = self.seed(random.Random(options['seed']), options)
+                seconds = time.perf_counter() - started
+                routes = [
+                    self.bench(viewer, fixtures, sample, options['iterations'])
+                    for sample in SAMPLE_REQUESTS if sample[0] in selected
+                ]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(json.dumps({
+            'dataset': {
+                key: options[key]
+                for key in ('members', 'posts', 'likes', 'comments', 'follows', 'zipf', 'seed')
+            },
+            'seed_seconds': round(seconds, 2),
+            'iterations': options['iterations'],
+            'routes': routes,
+        }, indent=2))
+
+    def seed(self, rng, options):
+        """
+        Bulk-create the graph. Popularity follows a Zipf law: a few members
+        attract most followers and write most posts, and a few posts attract
+        most likes and comments. Returns the viewer and the fixture ids used
+        by SAMPLE_REQUESTS.
+        """
+        password = make_password('password123')
+        members = Member.objects.bulk_create([
+            Member(
+                email='alice@example.com', username='alice',
+                first_name='Alice', last_name='A', password=password,
+            ),
+            Member(
+                email='bob@example.com', username='bob',
+                first_name='Bob', last_name='B', password=password,
+            ),
+        ] + [
+            Member(
+                email=f'member{i}@example.com', username=f'member{i}',
+                first_name='Member', last_name=str(i), password=password,
+            )
+            for i in range(2, options['members'])
+        ])
+        alice, bob = members[0], members[1]
+        # Bob heads every popularity ranking; Alice is an ordinary viewer
+        by_popularity = [bob] + members[2:] + [alice]
+        popular_members = Zipf(by_popularity, options['zipf'], rng)
+
+        follows = set()
+        wanted = min(options['follows'], len(members) - 1)
+        for follower in members:
+            followees = {bob.id} if follower is alice else set()
+            # Popular members are drawn repeatedly; give up on duplicates
+            # after a bounded number of attempts
+            for _ in range(wanted * 4):
+                if len(followees) >= wanted:
+                    break
+                followee = popular_members.draw()
+                if followee.id != follower.id:
+                    followees.add(followee.id)
+            follows.update((follower.id, followee_id) for followee_id in followees)
+        Follow.objects.bulk_create(
+            [Follow(follower_id=a, followee_id=b) for a, b in follows],
+            batch_size=1000,
+        )
+        counts = Follow.objects.order_by().values('followee').annotate(n=Count('id'))
+        for row in counts:
+            Member.objects.filter(id=row['followee']).update(followers_count=row['n'])
+
+        posts = Post.objects.bulk_create([
+            Post(
+                author=popular_members.draw(),
+                content=f'Post {i} about {rng.choice(TOPICS)} and {rng.choice(TOPICS)}',
+            )
+            for i in range(options['posts'])
+        ], batch_size=1000)
+        own_post = Post.objects.create(author=alice, content='My own post')
+        hot_post = next((post for post in posts if post.author_id == bob.id), posts[0])
+        posts.remove(hot_post)
+        popular_posts = Zipf([hot_post] + posts, options['zipf'], rng)
+
+        likes = set()
+        for _ in range(options['likes']):
+            likes.add((rng.choice(members).id, popular_posts.draw().id))
+        Like.objects.bulk_create(
+            [Like(member_id=m, post_id=p) for m, p in likes],
+            batch_size=1000,
+        )
+        Comment.objects.bulk_create([
+            Comment(
+                author=rng.choice(members),
+                post=popular_posts.draw(),
+                content=f'Comment {i}',
+            )
+            for i in range(options['comments'])
+        ], batch_size=1000)
+        comment = Comment.objects.create(author=alice, post=hot_post, content='First')
+        call_command('reconcile_counters', stdout=io.StringIO())
+
+        for post in Post.objects.order_by('id'):
+            fan_out_post(post)
+        # A steady-state sync: the viewer is a handful of changes behind
+        Change.objects.bulk_create(
+            [Change(kind=Change.POST_CREATED, post_id=post_id)
+             for post_id in Post.objects.order_by('created_at', 'id').values_list('id', flat=True)]
+            + [Change(kind=Change.POST_UPDATED, post_id=hot_post.id)] * 3,
+            batch_size=1000,
+        )
+        changes_since = Change.objects.order_by('-id').values_list('id', flat=True).first() - 5
+
+        return alice, {
+            'author': bob.id,
+            'post': hot_post.id,
+            'own_post': own_post.id,
+            'comment': comment.id,
+            'changes_since': changes_since,
+        }
+
+    def bench(self, viewer, fixtures, sample, iterations):
+        name, method, kwargs, query, body = sample
+        path = reverse(name, kwargs={key: fixtures[value] for key, value in kwargs.items()})
+        url = f'{path}?{query.format(**fixtures)}' if query else path
+        client = Client()
+        token = issue_session_token(viewer)
+
+        # Warm up imports and per-process caches outside the measurements
+        self.send(client, token, method, url, body)
+
+        latencies, query_counts = [], []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                status = self.send(client, token, method, url, body)
+                latencies.append(time.perf_counter() - started)
+            query_counts.append(sum(
+                1 for entry in captured.captured_queries
+                if not entry['sql'].lstrip().upper().startswith(TRANSACTION_CONTROL)
+            ))
+
+        tracemalloc.start()
+        self.send(client, token, method, url, body)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        return {
+            'route': name,
+            'method': method.upper(),
+            'url': url,
+            'status': status,
+            'p50_ms': round(cuts[49] * 1000, 3),
+            'p95_ms': round(cuts[94] * 1000, 3),
+            'p99_ms': round(cuts[98] * 1000, 3),
+            'queries': max(query_counts),
+            'peak_kib': round(peak / 1024, 1),
+        }
+
+    def send(self, client, token, method, url, body):
+        """
+        Issue one request inside a transaction that is rolled back, so write
+        routes see the same data on every iteration
+        """
+        client.cookies[SESSION_COOKIE_NAME] = token
+        data, content_type = encode_body(body)
+        with transaction.atomic():
+            response = getattr(client, method)(url, data=data, content_type=content_type)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            transaction.set_rollback(True)
+        return response.status_code
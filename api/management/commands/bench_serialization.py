@@ -0,0 +1,119 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Member, Post
+from api.serializers import PostSerializer, PostRowSerializer, parse_field_selection
+
+
+class Command(BaseCommand):
+    """Compare model serializers against the values() fast path"""
+    help = (
+        'Time PostSerializer against PostRowSerializer on pages of posts in '
+        'a throwaway database and report milliseconds per 100 posts as JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = self.run_benchmark(options['page_size'], options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run_benchmark(self, page_size, repeat):
+        member = Member.objects.create(
+            email='bench@example.com',
+            username='bench',
+            first_name='Bench',
+            last_name='Mark',
+            bio='Benchmarks things',
+        )
+        Post.objects.bulk_create(
+            [Post(author=member, content='x' * 280) for _ in range(page_size)]
+        )
+        queryset = Post.objects.select_related('author')[:page_size]
+        # Liked ids are supplied so only serialization is measured
+        context = {'liked_post_ids': set()}
+
+        # What a mobile list view asks for with ?fields=
+        sparse_fields = parse_field_selection('id,content,author.username,likes_count,comments_count')
+        sparse_context = {**context, 'fields': sparse_fields}
+
+        instances = list(queryset)
+        rows = list(PostRowSerializer.rows(queryset))
+        sparse_rows = list(PostRowSerializer.rows(queryset, sparse_fields))
+        scale = 100 / page_size
+
+        def per_100_posts(function):
+            function()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                function()
+            return (time.perf_counter() - started) / repeat * scale * 1000
+
+        serialize = {
+            'model_serializer': per_100_posts(
+                lambda: PostSerializer(instances, many=True, context=context).data
+            ),
+            'values_rows': per_100_posts(
+                lambda: PostRowSerializer(rows, context=context).data
+            ),
+            'values_rows_sideloaded': per_100_posts(
+                lambda: PostRowSerializer(rows, context={**context, 'members': {}}).data
+            ),
+            'values_rows_sparse': per_100_posts(
+                lambda: PostRowSerializer(sparse_rows, context=sparse_context).data
+            ),
+        }
+        sideloaded_context = {**context, 'members': {}}
+        payload_bytes = {
+            'embedded': len(JSONRenderer().render(
+                {'results': PostRowSerializer(rows, context=context).data}
+            )),
+            'sideloaded': len(JSONRenderer().render({
+                'results': PostRowSerializer(rows, context=sideloaded_context).data,
+                'members': sideloaded_context['members'],
+            })),
+            'sparse': len(JSONRenderer().render(
+                {'results': PostRowSerializer(sparse_rows, context=sparse_context).data}
+            )),
+        }
+        fetch_and_serialize = {
+            'model_serializer': per_100_posts(
+                lambda: PostSerializer(list(queryset), many=True, context=context).data
+            ),
+            'values_rows': per_100_posts(
+                lambda: PostRowSerializer(PostRowSerializer.rows(queryset), context=context).data
+            ),
+            'values_rows_sparse': per_100_posts(
+                lambda: PostRowSerializer(
+                    PostRowSerializer.rows(queryset, sparse_fields), context=sparse_context
+                ).data
+            ),
+        }
+
+        return {
+            'page_size': page_size,
+            'repeat': repeat,
+            'serialize_ms_per_100_posts': {k: round(v, 3) for k, v in serialize.items()},
+            'serialize_speedup': round(serialize['model_serializer'] / serialize['values_rows'], 1),
+            'payload_bytes': payload_bytes,
+            'fetch_and_serialize_ms_per_100_posts': {
+                k: round(v, 3) for k, v in fetch_and_serialize.items()
+            },
+            'fetch_and_serialize_speedup': round(
+                fetch_and_serialize['model_serializer'] / fetch_and_serialize['values_rows'], 1
+            ),
+        }
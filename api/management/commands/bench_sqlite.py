@@ -0,0 +1,122 @@
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+
+def _configure(path, profile):
+    """Point the default connection at path using a DB profile"""
+    connections.close_all()
+    connection = connections['default']
+    connection.settings_dict.update({
+        'NAME': path,
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': False,
+        **settings.SQLITE_PROFILES[profile],
+    })
+    return connection
+
+
+def _worker(path, profile, duration, write_ratio, seed, results):
+    connection = _configure(path, profile)
+    rng = random.Random(seed)
+    stats = {'reads': 0, 'writes': 0, 'lock_errors': 0}
+
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        try:
+            if rng.random() < write_ratio:
+                # Read-then-write, the pattern of get_or_create and counter
+                # maintenance, which upgrades a shared lock inside the
+                # transaction.
+                with transaction.atomic():
+                    with connection.cursor() as cursor:
+                        cursor.execute('SELECT COUNT(*) FROM bench WHERE bucket = %s', [rng.randrange(100)])
+                        cursor.execute(
+                            'INSERT INTO bench (bucket, payload) VALUES (%s, %s)',
+                            [rng.randrange(100), 'x' * 200]
+                        )
+                stats['writes'] += 1
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT COUNT(*) FROM bench WHERE bucket = %s', [rng.randrange(100)])
+                    cursor.fetchone()
+                stats['reads'] += 1
+        except OperationalError as exc:
+            if 'locked' not in str(exc):
+                raise
+            stats['lock_errors'] += 1
+
+    connection.close()
+    results.put(stats)
+
+
+class Command(BaseCommand):
+    """Measure SQLite throughput and lock errors under concurrent mixed load"""
+    help = (
+        'Run concurrent reader/writer processes against a scratch SQLite file '
+        'for each DB profile and report throughput and lock errors as JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=5.0)
+        parser.add_argument('--write-ratio', type=float, default=0.3)
+        parser.add_argument(
+            '--profiles',
+            default=','.join(settings.SQLITE_PROFILES),
+            help='Comma-separated DB profiles to compare',
+        )
+
+    def handle(self, *args, **options):
+        report = []
+        for profile in options['profiles'].split(','):
+            with tempfile.TemporaryDirectory() as directory:
+                report.append(self.run_profile(
+                    os.path.join(directory, 'bench.sqlite3'),
+                    profile,
+                    options
+                ))
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def run_profile(self, path, profile, options):
+        connection = _configure(path, profile)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TABLE bench (id INTEGER PRIMARY KEY, bucket INTEGER, payload TEXT)'
+            )
+            cursor.execute('CREATE INDEX bench_bucket ON bench (bucket)')
+        connections.close_all()
+
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        workers = [
+            context.Process(
+                target=_worker,
+                args=(path, profile, options['duration'], options['write_ratio'], seed, results)
+            )
+            for seed in range(options['workers'])
+        ]
+        for worker in workers:
+            worker.start()
+        totals = {'reads': 0, 'writes': 0, 'lock_errors': 0}
+        for _ in workers:
+            for key, value in results.get().items():
+                totals[key] += value
+        for worker in workers:
+            worker.join()
+
+        return {
+            'profile': profile,
+            'workers': options['workers'],
+            'duration_s': options['duration'],
+            'writes_per_s': round(totals['writes'] / options['duration']),
+            'reads_per_s': round(totals['reads'] / options['duration']),
+            'lock_errors': totals['lock_errors'],
+        }
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from api.authentication import SESSION_COOKIE_NAME, issue_session_token
+from api.caching import DISABLED_CACHES
+from api.models import Member, Post
+
+
+class Command(BaseCommand):
+    """Compare peak memory of buffered and streamed list responses"""
+    help = (
+        'Seed a throwaway test database and report peak Python memory of '
+        'buffered vs stream=1 responses for growing page sizes, as JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='500,2000,8000',
+            help='Comma-separated page sizes to measure',
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False):
+                results = self.run_benchmark(sizes)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run_benchmark(self, sizes):
+        member = Member.objects.create(
+            email='bench@example.com',
+            username='bench',
+            first_name='Bench',
+            last_name='Mark',
+        )
+        Post.objects.bulk_create(
+            [Post(author=member, content='x' * 280) for _ in range(max(sizes))],
+            batch_size=1000,
+        )
+
+        client = Client()
+        client.cookies[SESSION_COOKIE_NAME] = issue_session_token(member)
+
+        # Warm up imports and caches so they do not count towards the first peak
+        self.measure(client, '/api/posts/?cursor=&page_size=10&stream=1', stream=True)
+
+        results = []
+        for size in sizes:
+            url = f'/api/posts/?cursor=&page_size={size}'
+            with override_settings(MAX_PAGE_SIZE=size):
+                buffered_peak, buffered = self.measure(client, url, stream=False)
+            streamed_peak, streamed = self.measure(client, url + '&stream=1', stream=True)
+            results.append({
+                'page_size': size,
+                'response_bytes': buffered['length'],
+                'buffered_peak_kib': round(buffered_peak / 1024),
+                'streamed_peak_kib': round(streamed_peak / 1024),
+                'identical': buffered['digest'] == streamed['digest'],
+            })
+        return results
+
+    def measure(self, client, url, stream):
+        """Return the peak traced memory of one request and its body summary"""
+        digest = hashlib.sha256()
+        length = 0
+
+        tracemalloc.start()
+        response = client.get(url, HTTP_ACCEPT='application/json')
+        chunks = response.streaming_content if stream else [response.content]
+        for chunk in chunks:
+            # Pagination links carry the stream flag along; ignore it when
+            # comparing against the buffered body.
+            chunk = chunk.replace(b'&stream=1', b'')
+            digest.update(chunk)
+            length += len(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return peak, {'digest': digest.hexdigest(), 'length': length}
@@ -0,0 +1,194 @@
+import base64
+import json
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+
+from api.authentication import SESSION_COOKIE_NAME, issue_session_token
+from api.caching import DISABLED_CACHES
+from api.models import Member, Post, Like, Comment, Follow, Change
+from api.timeline import fan_out_post
+from api.urls import urlpatterns
+
+# Representative request per route: (url name, method, path kwargs, query
+# string, body). Path kwargs and `{name}` placeholders in the query string
+# are resolved against the seeded fixtures. Bodies are sent as JSON, or
+# as-is when they are bytes.
+SAMPLE_REQUESTS = [
+    ('auth-register', 'post', {}, '', {
+        'email': 'new@example.com', 'username': 'newbie', 'password': 'password123',
+        'first_name': 'New', 'last_name': 'Member',
+    }),
+    ('auth-login', 'post', {}, '', {'email': 'alice@example.com', 'password': 'password123'}),
+    ('auth-me', 'get', {}, '', None),
+    ('posts-list', 'get', {}, 'page=2&page_size=2', None),
+    ('posts-list', 'get', {}, 'cursor=&page_size=2', None),
+    ('posts-list', 'get', {}, 'cursor=&page_size=2&fields=id,content,author.username,likes_count', None),
+    ('feed-home', 'get', {}, 'page_size=2', None),
+    ('posts-search', 'get', {}, 'q=post', None),
+    ('posts-create', 'post', {}, '', {'content': 'Explained'}),
+    ('posts-detail', 'get', {'id': 'post'}, '', None),
+    ('posts-like', 'post', {'id': 'post'}, '', None),
+    ('posts-like-state', 'get', {}, 'ids={post},{own_post}', None),
+    ('changes-list', 'get', {}, 'since={changes_since}', None),
+    ('comments-list', 'get', {'post_id': 'post'}, '', None),
+    ('comments-create', 'post', {'post_id': 'post'}, '', {'content': 'Nice'}),
+    ('profile-detail', 'get', {'id': 'author'}, '', None),
+    ('profile-detail', 'get', {'id': 'author'}, 'fields=username,posts_next', None),
+    ('profile-posts', 'get', {'id': 'author'}, 'page_size=2', None),
+    ('profile-posts', 'get', {'id': 'author'}, 'page_size=2&fields=id,content', None),
+    ('profile-update', 'patch', {}, '', {'bio': 'Updated'}),
+    ('profile-avatar', 'put', {}, '', base64.b64decode(
+        'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR4nGNgYGD4DwABBAEAwS2OUAAAAABJRU5ErkJggg=='
+    )),
+    ('profile-follow', 'post', {'id': 'author'}, '', None),
+    ('profile-follow', 'delete', {'id': 'author'}, '', None),
+    ('comments-delete', 'delete', {'id': 'comment'}, '', None),
+    ('posts-delete', 'delete', {'id': 'own_post'}, '', None),
+    ('batch', 'post', {}, '', {'requests': [
+        {'path': '/api/auth/me/'}, {'path': '/api/posts/?page_size=2'},
+    ]}),
+    ('auth-logout', 'post', {}, '', None),
+]
+
+
+
+def encode_body(body):
+    """Return (data, content_type) for a SAMPLE_REQUESTS body"""
+    if isinstance(body, bytes):
+        return body, 'application/octet-stream'
+    return (json.dumps(body) if body is not None else None), 'application/json'
+
+
+# Plan lines that are inherent to a route and reviewed as acceptable
+EXPECTED_PROBLEMS = {
+    # Relevance order is computed per match, so ranking always sorts
+    'posts-search': {'USE TEMP B-TREE FOR ORDER BY'},
+}
+
+
+def problems_in_plan(plan, expected=()):
+    """Return plan lines that indicate a full table scan or a temp B-tree sort"""
+    problems = []
+    for _, _, _, detail in plan:
+        if detail in expected:
+            continue
+        if (detail.startswith('SCAN ') and ' USING ' not in detail
+                and 'CONSTANT ROW' not in detail and 'VIRTUAL TABLE' not in detail):
+            problems.append(detail)
+        elif 'USE TEMP B-TREE' in detail:
+            problems.append(detail)
+    return problems
+
+
+class Command(BaseCommand):
+    """Run EXPLAIN QUERY PLAN on every query the API endpoints issue"""
+    help = (
+        'Issue a representative request to every route in api/urls.py on a '
+        'seeded throwaway database, EXPLAIN each query and flag full scans '
+        'and temp B-tree sorts'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+
+    def handle(self, *args, **options):
+        covered = {name for name, *_ in SAMPLE_REQUESTS}
+        missing = [pattern.name for pattern in urlpatterns if pattern.name not in covered]
+        if missing:
+            raise CommandError(f'No sample request for route(s): {", ".join(missing)}')
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with tempfile.TemporaryDirectory() as media_root, override_settings(
+                CACHES=DISABLED_CACHES, METRICS_ENABLED=False, MEDIA_ROOT=media_root
+            ):
+                report = self.explain_all()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        flagged = [entry for entry in report if entry['problems']]
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            for entry in flagged:
+                self.stdout.write(f"{entry['route']} {entry['method'].upper()}: {entry['sql']}")
+                for problem in entry['problems']:
+                    self.stdout.write(f'    {problem}')
+
+        if flagged:
+            raise CommandError(f'{len(flagged)} query plan(s) with full scans or temp sorts')
+        if not options['json']:
+            self.stdout.write(self.style.SUCCESS(f'{len(report)} queries explained, no problems found'))
+
+    def seed(self):
+        alice = Member(email='alice@example.com', username='alice', first_name='Alice', last_name='A')
+        bob = Member(email='bob@example.com', username='bob', first_name='Bob', last_name='B')
+        for member in (alice, bob):
+            member.set_password('password123')
+            member.save()
+
+        Follow.objects.create(follower=alice, followee=bob)
+        Member.objects.filter(id=bob.id).update(followers_count=1)
+        posts = [Post.objects.create(author=bob, content=f'Post {i}') for i in range(5)]
+        own_post = Post.objects.create(author=alice, content='Mine')
+        for post in posts + [own_post]:
+            fan_out_post(post)
+        Like.objects.create(member=alice, post=posts[1])
+        comment = Comment.objects.create(author=alice, post=posts[0], content='First')
+        Change.objects.bulk_create(
+            [Change(kind=Change.POST_UPDATED, post_id=post.id) for post in posts[:2]]
+            + [Change(kind=Change.POST_CREATED, post_id=post.id) for post in posts[2:] + [own_post]]
+        )
+
+        return alice, {
+            'author': bob.id,
+            'post': posts[0].id,
+            'own_post': own_post.id,
+            'comment': comment.id,
+            'changes_since': 0,
+        }
+
+    def explain_all(self):
+        viewer, fixtures = self.seed()
+        client = Client()
+        client.cookies[SESSION_COOKIE_NAME] = issue_session_token(viewer)
+
+        report = []
+        for name, method, kwargs, query, body in SAMPLE_REQUESTS:
+            path = reverse(name, kwargs={key: fixtures[value] for key, value in kwargs.items()})
+            url = f'{path}?{query.format(**fixtures)}' if query else path
+
+            data, content_type = encode_body(body)
+            with CaptureQueriesContext(connection) as captured:
+                response = getattr(client, method)(url, data=data, content_type=content_type)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+
+            for query_info in captured.captured_queries:
+                sql = query_info['sql']
+                if not sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE', 'INSERT')):
+                    continue
+                with connection.cursor() as cursor:
+                    cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                    plan = cursor.fetchall()
+                report.append({
+                    'route': name,
+                    'method': method,
+                    'status': response.status_code,
+                    'sql': sql,
+                    'plan': [row[3] for row in plan],
+                    'problems': problems_in_plan(plan, EXPECTED_PROBLEMS.get(name, ())),
+                })
+        return report
@@ -0,0 +1,114 @@
+import http.client
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.authentication import SESSION_COOKIE_NAME
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _client(target, path, cookie, deadline, latencies, errors, lock):
+    connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+    headers = {'Cookie': f'{SESSION_COOKIE_NAME}={cookie}'} if cookie else {}
+    local_latencies, local_errors = [], 0
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                local_errors += 1
+        except (OSError, http.client.HTTPException):
+            local_errors += 1
+            connection.close()
+            continue
+        local_latencies.append(time.perf_counter() - started)
+    connection.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors.append(local_errors)
+
+
+class Command(BaseCommand):
+    """Measure throughput of a running server at increasing concurrency"""
+    help = (
+        'Send keep-alive GET requests to a running server from N concurrent '
+        'clients for each concurrency level and report throughput and '
+        'latency as JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8001')
+        parser.add_argument('--path', default='/api/posts/?cursor=&page_size=20')
+        parser.add_argument(
+            '--concurrency',
+            default='1,2,4,8,16,32',
+            help='Comma-separated numbers of concurrent clients',
+        )
+        parser.add_argument('--duration', type=float, default=5.0)
+        parser.add_argument(
+            '--email',
+            help='Log in as this member first; --password is then required',
+        )
+        parser.add_argument('--password')
+
+    def handle(self, *args, **options):
+        target = urlsplit(options['url'])
+        cookie = self.login(target, options['email'], options['password']) if options['email'] else None
+
+        report = []
+        for clients in [int(level) for level in options['concurrency'].split(',')]:
+            latencies, errors, lock = [], [], threading.Lock()
+            deadline = time.monotonic() + options['duration']
+            threads = [
+                threading.Thread(
+                    target=_client,
+                    args=(target, options['path'], cookie, deadline, latencies, errors, lock)
+                )
+                for _ in range(clients)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            report.append({
+                'concurrency': clients,
+                'requests': len(latencies),
+                'errors': sum(errors),
+                'requests_per_second': round(len(latencies) / options['duration'], 1),
+                'p50_ms': round(statistics.median(latencies) * 1000, 2) if latencies else None,
+                'p95_ms': round(_percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+            })
+
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def login(self, target, email, password):
+        if not password:
+            raise CommandError('--password is required with --email')
+        connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+        connection.request(
+            'POST',
+            '/api/auth/login/',
+            body=json.dumps({'email': email, 'password': password}),
+            headers={'Content-Type': 'application/json'}
+        )
+        response = connection.getresponse()
+        response.read()
+        connection.close()
+        if response.status != 200:
+            raise CommandError(f'Login failed with status {response.status}')
+        for header in response.headers.get_all('Set-Cookie') or []:
+            name, _, rest = header.partition('=')
+            if name.strip() == SESSION_COOKIE_NAME:
+                return rest.split(';', 1)[0]
+        raise CommandError('Login response did not set a session cookie')
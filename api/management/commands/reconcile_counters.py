@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Post
+
+
+class Command(BaseCommand):
+    """Recompute denormalized post counters and fix any drift"""
+    help = 'Recompute likes_count/comments_count on posts and fix drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report drifted posts, do not write',
+        )
+
+    def handle(self, *args, **options):
+        drifted = Post.reconcile_counters(dry_run=options['dry_run'])
+
+        verb = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(
+            self.style.SUCCESS(f'{verb} {len(drifted)} post(s) with drifted counters')
+        )
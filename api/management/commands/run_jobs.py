@@ -0,0 +1,67 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api import jobs
+
+
+class Command(BaseCommand):
+    """Background worker for the database job queue"""
+    help = (
+        'Claim and run queued jobs until stopped, enqueueing the periodic '
+        'tasks in JOB_SCHEDULE as they fall due. SIGTERM or SIGINT stops '
+        'the worker after the job in progress'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run every job that is due, then exit',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.JOB_POLL_INTERVAL,
+            help='Seconds to sleep when no job is due',
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        if not options['once']:
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+
+        # Every worker schedules on its own; tasks are safe to run twice
+        next_runs = {name: time.monotonic() for name in settings.JOB_SCHEDULE}
+        succeeded = failed = 0
+        while not self.stopping:
+            close_old_connections()
+            if not options['once']:
+                self.enqueue_due(next_runs)
+            job = jobs.claim()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+            if jobs.run(job):
+                succeeded += 1
+            else:
+                failed += 1
+
+        close_old_connections()
+        self.stdout.write(f'Ran {succeeded + failed} job(s): {succeeded} succeeded, {failed} failed')
+
+    def enqueue_due(self, next_runs):
+        now = time.monotonic()
+        for name, next_run in next_runs.items():
+            if now >= next_run:
+                jobs.enqueue(name)
+                next_runs[name] = now + settings.JOB_SCHEDULE[name]
+
+    def stop(self, signum, frame):
+        self.stopping = True
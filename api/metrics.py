@@ -0,0 +1,221 @@
+import fcntl
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.http import HttpResponse
+
+# Upper bounds of the request latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, math.inf)
+
+METRICS = {
+    'api_requests_total': ('counter', 'Requests served, by view, method and status class'),
+    'api_request_duration_seconds': ('histogram', 'Time spent in Django per request, by view'),
+    'api_db_queries_total': ('counter', 'SQL statements executed, by view'),
+}
+
+ARCHIVE_NAME = 'archive.db'
+
+
+class MmapStore:
+    """
+    Append-only map of string keys to float64 values in a memory-mapped file.
+
+    Layout: an int32 holding the number of bytes in use, then entries of
+    [int32 key length][utf-8 key, padded to 8 bytes][float64 value]. Each
+    file has exactly one writing process, so values are updated in place
+    without locking; readers see every entry whose append has completed,
+    because the used size is written last.
+    """
+    INITIAL_SIZE = 64 * 1024
+
+    def __init__(self, path):
+        self._file = open(path, 'a+b')
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(self.INITIAL_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._used = struct.unpack_from('i', self._map, 0)[0] or 8
+        self._positions = {key: position for key, _, position in _entries(self._map, self._used)}
+
+    def inc(self, key, amount=1.0):
+        position = self._positions.get(key)
+        if position is None:
+            position = self._append(key)
+        value = struct.unpack_from('d', self._map, position)[0]
+        struct.pack_into('d', self._map, position, value + amount)
+
+    def _append(self, key):
+        encoded = key.encode()
+        padding = -(4 + len(encoded)) % 8
+        entry = struct.pack(f'i{len(encoded)}s{padding}xd', len(encoded), encoded, 0.0)
+        while self._used + len(entry) > len(self._map):
+            self._map.close()
+            self._file.truncate(os.fstat(self._file.fileno()).st_size * 2)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        self._map[self._used:self._used + len(entry)] = entry
+        position = self._used + len(entry) - 8
+        self._used += len(entry)
+        struct.pack_into('i', self._map, 0, self._used)
+        self._positions[key] = position
+        return position
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def _entries(buffer, used):
+    """Yield (key, value, value position) for every entry in a store buffer"""
+    position = 8
+    while position < used:
+        length = struct.unpack_from('i', buffer, position)[0]
+        key = bytes(buffer[position + 4:position + 4 + length]).decode()
+        position += 4 + length + (-(4 + length) % 8)
+        yield key, struct.unpack_from('d', buffer, position)[0], position
+        position += 8
+
+
+def _read(path):
+    with open(path, 'rb') as handle:
+        buffer = handle.read()
+    if len(buffer) < 8:
+        return []
+    used = struct.unpack_from('i', buffer, 0)[0]
+    return [(key, value) for key, value, _ in _entries(buffer, used)]
+
+
+_lock = threading.Lock()
+_store = None
+_store_path = None
+
+
+def _process_store():
+    """Return this process's store, opening a new one after a fork"""
+    global _store, _store_path
+    path = os.path.join(settings.METRICS_DIR, f'{os.getpid()}.db')
+    if _store_path != path:
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        _store = MmapStore(path)
+        _store_path = path
+    return _store
+
+
+def _key(name, **labels):
+    return json.dumps([name, sorted(labels.items())])
+
+
+def observe_request(view, method, status_code, duration, queries):
+    """Record one finished request in this process's store"""
+    bucket = next(bound for bound in LATENCY_BUCKETS if duration <= bound)
+    with _lock:
+        store = _process_store()
+        store.inc(_key('api_requests_total', view=view, method=method, status=f'{status_code // 100}xx'))
+        store.inc(_key('api_request_duration_seconds_bucket', view=view, le=bucket))
+        store.inc(_key('api_request_duration_seconds_sum', view=view), duration)
+        store.inc(_key('api_request_duration_seconds_count', view=view))
+        store.inc(_key('api_db_queries_total', view=view), queries)
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _compact(directory):
+    """
+    Fold the stores of exited processes into the archive, so recycled
+    workers keep their totals and the directory does not grow without bound
+    """
+    with open(os.path.join(directory, 'compact.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive = None
+        for name in os.listdir(directory):
+            pid = name.removesuffix('.db')
+            if not (name.endswith('.db') and pid.isdigit()) or _is_running(int(pid)):
+                continue
+            path = os.path.join(directory, name)
+            archive = archive or MmapStore(os.path.join(directory, ARCHIVE_NAME))
+            for key, value in _read(path):
+                archive.inc(key, value)
+            os.remove(path)
+        if archive is not None:
+            archive.close()
+
+
+def collect():
+    """Sum the stores of every process into {key: value}"""
+    directory = settings.METRICS_DIR
+    if not os.path.isdir(directory):
+        return {}
+    _compact(directory)
+    totals = defaultdict(float)
+    for name in os.listdir(directory):
+        if name.endswith('.db'):
+            for key, value in _read(os.path.join(directory, name)):
+                totals[key] += value
+    return totals
+
+
+def _format_labels(labels):
+    return ','.join(f'{name}="{_format_value(value)}"' for name, value in labels)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def render(totals):
+    """Render collected metrics in the Prometheus text exposition format"""
+    series = defaultdict(list)
+    for key, value in totals.items():
+        name, labels = json.loads(key)
+        series[name].append((tuple(map(tuple, labels)), value))
+
+    lines = []
+    for metric, (kind, description) in METRICS.items():
+        lines.append(f'# HELP {metric} {description}')
+        lines.append(f'# TYPE {metric} {kind}')
+        if kind == 'counter':
+            for labels, value in sorted(series[metric]):
+                lines.append(f'{metric}{{{_format_labels(labels)}}} {_format_value(value)}')
+            continue
+
+        # Histogram buckets are stored per bucket and exposed cumulatively
+        buckets = defaultdict(dict)
+        for labels, value in series[f'{metric}_bucket']:
+            labels = dict(labels)
+            bound = labels.pop('le')
+            buckets[tuple(sorted(labels.items()))][bound] = value
+        sums = dict(series[f'{metric}_sum'])
+        counts = dict(series[f'{metric}_count'])
+        for labels in sorted(counts):
+            cumulative = 0
+            for bound in LATENCY_BUCKETS:
+                cumulative += buckets[labels].get(bound, 0)
+                bucket_labels = _format_labels([*labels, ('le', bound)])
+                lines.append(f'{metric}_bucket{{{bucket_labels}}} {_format_value(cumulative)}')
+            lines.append(f'{metric}_sum{{{_format_labels(labels)}}} {sums.get(labels, 0)}')
+            lines.append(f'{metric}_count{{{_format_labels(labels)}}} {_format_value(counts[labels])}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """GET /metrics - Request metrics of all workers in text format"""
+    return HttpResponse(
+        render(collect()),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -0,0 +1,211 @@
+import heapq
+import itertools
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from api.metrics import observe_request
+
+logger = logging.getLogger(__name__)
+
+
+class QueryTimer:
+    """
+    connection.execute_wrapper that counts and times statements and keeps
+    the slowest few. Parameters are never recorded, only the SQL text.
+    """
+    def __init__(self, keep):
+        self.count = 0
+        self.duration = 0.0
+        self.keep = keep
+        self.slowest = []
+        self._order = itertools.count()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.count += 1
+            self.duration += duration
+            entry = (duration, next(self._order), sql)
+            if len(self.slowest) < self.keep:
+                heapq.heappush(self.slowest, entry)
+            else:
+                heapq.heappushpop(self.slowest, entry)
+
+    def top(self):
+        return [
+            {'ms': round(duration * 1000, 2), 'sql': sql[:1000]}
+            for duration, _, sql in sorted(self.slowest, reverse=True)
+        ]
+
+
+def wrap_connections(stack, wrapper):
+    """
+    Install execute wrapper on every database connection of the calling
+    thread until stack is closed. Connections are per thread, so async
+    callers run this through sync_to_async to reach the thread their
+    queries run on.
+    """
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(wrapper))
+
+
+class RequestTimingMiddleware:
+    """
+    Break request time down into db, serialize (JSON rendering), auth and
+    total, and report it in a Server-Timing header.
+
+    SQL is only instrumented for a REQUEST_TIMING_SAMPLE_RATE fraction of
+    requests; the others carry just the total. Requests slower than
+    SLOW_REQUEST_MS are logged as one JSON record with the
+    SLOW_REQUEST_TOP_QUERIES slowest statements when they were sampled;
+    time a long poll spent waiting for changes does not count as slow.
+    Rows that a streamed response reads after the view returns are not
+    counted.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        timer = None
+        if random.random() < settings.REQUEST_TIMING_SAMPLE_RATE:
+            timer = QueryTimer(settings.SLOW_REQUEST_TOP_QUERIES)
+            with ExitStack() as stack:
+                wrap_connections(stack, timer)
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+        return self.report(request, response, started, timer)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        timer = None
+        if random.random() < settings.REQUEST_TIMING_SAMPLE_RATE:
+            timer = QueryTimer(settings.SLOW_REQUEST_TOP_QUERIES)
+            stack = ExitStack()
+            await sync_to_async(wrap_connections)(stack, timer)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        else:
+            response = await self.get_response(request)
+        return self.report(request, response, started, timer)
+
+    def report(self, request, response, started, timer):
+        """Add the Server-Timing header and log the request if it was slow"""
+        total = time.perf_counter() - started
+
+        metrics = {'total': total}
+        if timer is not None:
+            metrics['db'] = timer.duration
+        for name, attribute in (
+            ('serialize', 'render_duration'),
+            ('auth', 'auth_duration'),
+            ('wait', 'wait_duration'),
+        ):
+            duration = getattr(request, attribute, None)
+            if duration is not None:
+                metrics[name] = duration
+        entries = []
+        for name, duration in metrics.items():
+            entry = f'{name};dur={duration * 1000:.2f}'
+            if name == 'db':
+                entry += f';desc="{timer.count} queries"'
+            entries.append(entry)
+        response['Server-Timing'] = ', '.join(entries)
+
+        if (total - metrics.get('wait', 0)) * 1000 >= settings.SLOW_REQUEST_MS:
+            record = {
+                'event': 'slow_request',
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                **{f'{name}_ms': round(duration * 1000, 2) for name, duration in metrics.items()},
+            }
+            if timer is not None:
+                record['queries'] = timer.count
+                record['slowest'] = timer.top()
+            logger.warning(json.dumps(record))
+
+        return response
+
+
+class QueryCounter:
+    """connection.execute_wrapper that only counts statements"""
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """
+    Record request count, latency and SQL statement count per view class in
+    the multi-process metrics store (api.metrics), exposed at /metrics
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            wrap_connections(stack, counter)
+            response = self.get_response(request)
+        self.observe(request, response, started, counter)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        started = time.perf_counter()
+        counter = QueryCounter()
+        stack = ExitStack()
+        await sync_to_async(wrap_connections)(stack, counter)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        self.observe(request, response, started, counter)
+        return response
+
+    def observe(self, request, response, started, counter):
+        """Record the finished request in this process's metrics store"""
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        if match is None:
+            view = 'unmatched'
+        else:
+            view = getattr(match.func, 'view_class', match.func).__name__
+        observe_request(view, request.method, response.status_code, duration, counter.count)
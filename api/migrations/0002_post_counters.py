@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-17 02:37
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    Post = apps.get_model('api', 'Post')
+    Like = apps.get_model('api', 'Like')
+    Comment = apps.get_model('api', 'Comment')
+
+    likes = (
+        Like.objects.filter(post=OuterRef('pk'))
+        .order_by().values('post').annotate(n=Count('id')).values('n')
+    )
+    comments = (
+        Comment.objects.filter(post=OuterRef('pk'))
+        .order_by().values('post').annotate(n=Count('id')).values('n')
+    )
+    Post.objects.update(
+        likes_count=Coalesce(Subquery(likes), 0),
+        comments_count=Coalesce(Subquery(comments), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
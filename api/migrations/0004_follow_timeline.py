@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-17 02:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_post_feed_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='Follow',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('followee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='followers', to='api.member')),
+                ('follower', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following', to='api.member')),
+            ],
+            options={
+                'db_table': 'follow',
+                'ordering': ['-created_at'],
+                'unique_together': {('follower', 'followee')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('author', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.member')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline', to='api.member')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='api.post')),
+            ],
+            options={
+                'db_table': 'timeline_entry',
+                'indexes': [models.Index(fields=['owner', '-created_at', '-post'], name='timeline_owner_created_idx'), models.Index(fields=['owner', 'author'], name='timeline_owner_author_idx')],
+                'unique_together': {('owner', 'post')},
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.7 on 2026-10-17 02:49
+
+from django.db import migrations
+
+# External-content FTS5 index over post.content, kept in sync by triggers.
+# Note that any later migration which makes Django rebuild the post table
+# drops these triggers; such migrations must re-create them.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE post_fts USING fts5(
+        content,
+        content='post',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER post_fts_insert AFTER INSERT ON post BEGIN
+        INSERT INTO post_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER post_fts_delete AFTER DELETE ON post BEGIN
+        INSERT INTO post_fts(post_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER post_fts_update AFTER UPDATE OF content ON post BEGIN
+        INSERT INTO post_fts(post_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO post_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    "INSERT INTO post_fts(post_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS post_fts_update',
+    'DROP TRIGGER IF EXISTS post_fts_delete',
+    'DROP TRIGGER IF EXISTS post_fts_insert',
+    'DROP TABLE IF EXISTS post_fts',
+]
+
+
+def create_post_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_post_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_post_fts, drop_post_fts),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-17 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_job_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('post_created', 'Post created'), ('post_updated', 'Post likes or comments changed'), ('post_deleted', 'Post deleted')], max_length=20)),
+                ('post_id', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'change_log',
+            },
+        ),
+    ]
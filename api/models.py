@@ -1,6 +1,22 @@
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 from django.contrib.auth.hashers import make_password, check_password
 
+from api.caching import bump, post_scope
+
+
+def shifted(field, delta):
+    """
+    Expression adding delta to a counter column. Decrements stop at zero, so
+    a counter that has drifted low cannot trip the non-negative CHECK and
+    fail the write that shifts it; reconciliation repairs the count later.
+    """
+    if delta < 0:
+        return Greatest(F(field) + delta, 0)
+    return F(field) + delta
+
 
 class Member(models.Model):
     """Custom user model for the social network"""
@@ -12,11 +28,15 @@ class Member(models.Model):
     last_name = models.CharField(max_length=100)
     bio = models.TextField(blank=True, default='')
     avatar_url = models.URLField(blank=True, null=True, max_length=500)
+    followers_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = 'member'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='member_created_idx'),
+        ]
 
     def __str__(self):
         return self.username
@@ -54,30 +74,108 @@ class Post(models.Model):
     author = models.ForeignKey(
         Member,
         on_delete=models.CASCADE,
-        related_name='posts'
+        related_name='posts',
+        db_index=False
     )
     content = models.TextField()
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'post'
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='post_created_id_idx'),
+            models.Index(
+                fields=['author', '-created_at', '-id'],
+                name='post_author_created_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Post {self.id} by {self.author.username}"
 
+    @classmethod
+    def adjust_counters(cls, post_id, likes=0, comments=0):
+        """Atomically shift the denormalized like/comment counters of a post"""
+        changes = {}
+        if likes:
+            changes['likes_count'] = shifted('likes_count', likes)
+        if comments:
+            changes['comments_count'] = shifted('comments_count', comments)
+        if not changes:
+            return 0
+        return cls.objects.filter(id=post_id).update(**changes)
+
+    @classmethod
+    def reconcile_counters(cls, post_ids=None, dry_run=False):
+        """
+        Recompute likes_count/comments_count from the like and comment rows,
+        for the given posts or all of them, and return the ids that drifted.
+        Cached responses showing the repaired posts are invalidated.
+        """
+        likes = (
+            Like.objects.filter(post=OuterRef('pk'))
+            .order_by().values('post').annotate(n=Count('id')).values('n')
+        )
+        comments = (
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by().values('post').annotate(n=Count('id')).values('n')
+        )
+        posts = cls.objects.all() if post_ids is None else cls.objects.filter(id__in=post_ids)
+
+        with transaction.atomic():
+            drifted = list(
+                posts.annotate(
+                    actual_likes=Coalesce(Subquery(likes), 0),
+                    actual_comments=Coalesce(Subquery(comments), 0),
+                )
+                .exclude(
+                    likes_count=F('actual_likes'),
+                    comments_count=F('actual_comments'),
+                )
+                .order_by()
+                .values_list('id', flat=True)
+            )
+
+            if drifted and not dry_run:
+                cls.objects.filter(id__in=drifted).update(
+                    likes_count=Coalesce(Subquery(likes), 0),
+                    comments_count=Coalesce(Subquery(comments), 0),
+                )
+                bump('posts', *(post_scope(post_id) for post_id in drifted))
+        return drifted
+
+
+def purge_post_activity(post_id, batch_size=1000):
+    """
+    Remove the likes and comments a deleted post left behind, one batch per
+    statement so the write lock is never held for a whole post
+    """
+    for model in (Like, Comment):
+        while True:
+            ids = list(model.objects.filter(post_id=post_id).values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            model.objects.filter(id__in=ids).delete()
+
 
 class Like(models.Model):
     """Model for post likes"""
     id = models.AutoField(primary_key=True)
     member = models.ForeignKey(
         Member,
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        db_index=False
     )
+    # Likes and comments of a deleted post are removed by a background job
+    # (api.tasks.purge_deleted_post) rather than cascaded inline
     post = models.ForeignKey(
         Post,
-        on_delete=models.CASCADE,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
         related_name='likes'
     )
     created_at = models.DateTimeField(auto_now_add=True)
@@ -90,6 +188,48 @@ class Like(models.Model):
     def __str__(self):
         return f"{self.member.username} likes Post {self.post.id}"
 
+    @classmethod
+    def toggle(cls, member_id, post_id):
+        """
+        Like or unlike a post and return (is_liked, likes_count), or None if
+        the post does not exist.
+
+        Runs as at most three statements in one transaction: delete the like;
+        if there was none, insert it guarded by the post's existence; then
+        shift the counter and read it back with RETURNING. A concurrent
+        toggle that already inserted the like leaves the counter untouched.
+        """
+        like_table = connection.ops.quote_name(cls._meta.db_table)
+        post_table = connection.ops.quote_name(Post._meta.db_table)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {like_table} WHERE member_id = %s AND post_id = %s',
+                [member_id, post_id]
+            )
+            if cursor.rowcount:
+                is_liked, delta = False, -1
+            else:
+                cursor.execute(
+                    f'INSERT INTO {like_table} (member_id, post_id, created_at) '
+                    f'SELECT %s, id, %s FROM {post_table} WHERE id = %s '
+                    f'ON CONFLICT DO NOTHING',
+                    [
+                        member_id,
+                        connection.ops.adapt_datetimefield_value(timezone.now()),
+                        post_id,
+                    ]
+                )
+                is_liked, delta = True, cursor.rowcount
+            cursor.execute(
+                f'UPDATE {post_table} SET likes_count = likes_count + %s '
+                f'WHERE id = %s RETURNING likes_count',
+                [delta, post_id]
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        return is_liked, row[0]
+
 
 class Comment(models.Model):
     """Model for post comments"""
@@ -98,17 +238,166 @@ class Comment(models.Model):
         Member,
         on_delete=models.CASCADE
     )
+    # Removed with the post's likes by api.tasks.purge_deleted_post
     post = models.ForeignKey(
         Post,
-        on_delete=models.CASCADE,
-        related_name='comments'
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='comments',
+        db_index=False
     )
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = 'comment'
-        ordering = ['created_at']
+        ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(fields=['post', 'created_at', 'id'], name='comment_post_created_idx'),
+        ]
 
     def __str__(self):
         return f"Comment {self.id} by {self.author.username} on Post {self.post.id}"
+
+
+class Follow(models.Model):
+    """Model for a member following another member"""
+    id = models.AutoField(primary_key=True)
+    follower = models.ForeignKey(
+        Member,
+        on_delete=models.CASCADE,
+        related_name='following',
+        db_index=False
+    )
+    followee = models.ForeignKey(
+        Member,
+        on_delete=models.CASCADE,
+        related_name='followers',
+        db_index=False
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'follow'
+        unique_together = ['follower', 'followee']
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['followee', 'follower'], name='follow_followee_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.follower.username} follows {self.followee.username}"
+
+
+class TimelineEntry(models.Model):
+    """
+    Materialized home timeline row: post delivered to owner's inbox.
+
+    created_at mirrors the post's created_at so a page of the home feed is a
+    single range scan on (owner, created_at, post).
+    """
+    id = models.BigAutoField(primary_key=True)
+    owner = models.ForeignKey(
+        Member,
+        on_delete=models.CASCADE,
+        related_name='timeline',
+        db_index=False
+    )
+    # Deleting a post leaves its entries behind for a background purge job
+    # (api.tasks.purge_post_timeline) instead of cascading over every
+    # follower's timeline inline; reads already skip entries whose post is gone
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='timeline_entries'
+    )
+    author = models.ForeignKey(
+        Member,
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'timeline_entry'
+        unique_together = ['owner', 'post']
+        indexes = [
+            models.Index(
+                fields=['owner', '-created_at', '-post'],
+                name='timeline_owner_created_idx',
+            ),
+            models.Index(fields=['owner', 'author'], name='timeline_owner_author_idx'),
+        ]
+
+    def __str__(self):
+        return f"Post {self.post_id} in timeline of member {self.owner_id}"
+
+
+class Change(models.Model):
+    """
+    Append-only log of writes that change what the post feed shows, read
+    by GET /api/changes/. The id is the sync cursor: SQLite serializes
+    writers and AUTOINCREMENT never reuses ids, so entries become visible
+    in id order and a client that has seen id N has seen everything before.
+    """
+    POST_CREATED = 'post_created'
+    POST_UPDATED = 'post_updated'
+    POST_DELETED = 'post_deleted'
+    KIND_CHOICES = [
+        (POST_CREATED, 'Post created'),
+        (POST_UPDATED, 'Post likes or comments changed'),
+        (POST_DELETED, 'Post deleted'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # A plain integer rather than a foreign key, so entries outlive the post
+    post_id = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'change_log'
+
+    def __str__(self):
+        return f"Change {self.id}: {self.kind} {self.post_id}"
+
+
+class Job(models.Model):
+    """
+    Deferred task in the database job queue; see api.jobs.
+
+    A claimed job is marked running and its run_at is pushed forward by the
+    lease, so a job whose worker died is claimed again once run_at passes.
+    attempts doubles as a fencing token: a worker can only finish or retry
+    the job if nobody has claimed it since.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(QUEUED, 'Queued'), (RUNNING, 'Running'), (FAILED, 'Failed')]
+
+    id = models.BigAutoField(primary_key=True)
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField()
+    run_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'job'
+        indexes = [
+            # Only claimable jobs are indexed; failed jobs stay out of the way
+            models.Index(
+                fields=['run_at'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='job_claimable_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Job {self.id} ({self.task}, {self.status})"
@@ -0,0 +1,217 @@
+import base64
+import binascii
+import json
+
+from django.db.models import Max, Min, Q
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client supplies a malformed or tampered cursor"""
+
+
+def encode_cursor(payload):
+    """Encode a cursor payload into an opaque URL-safe token"""
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode an opaque cursor token back into its payload"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error):
+        raise InvalidCursor(token)
+    if not isinstance(payload, dict):
+        raise InvalidCursor(token)
+    return payload
+
+
+def cursor_link(request, cursor):
+    """Build a link to the current endpoint with the given cursor"""
+    if cursor is None:
+        return None
+    params = request.GET.copy()
+    params['cursor'] = cursor
+    params.pop('page', None)
+    return f'{request.path}?{params.urlencode()}'
+
+
+def approximate_count(queryset):
+    """
+    Cheap upper-bound row count from the primary key range.
+
+    Both MIN and MAX are answered from the primary key B-tree, so this stays
+    O(log n) where COUNT(*) has to walk the whole table.
+    """
+    bounds = queryset.order_by().aggregate(low=Min('pk'), high=Max('pk'))
+    if bounds['high'] is None:
+        return 0
+    return bounds['high'] - bounds['low'] + 1
+
+
+async def aapproximate_count(queryset):
+    """Async version of approximate_count()"""
+    bounds = await queryset.order_by().aaggregate(low=Min('pk'), high=Max('pk'))
+    if bounds['high'] is None:
+        return 0
+    return bounds['high'] - bounds['low'] + 1
+
+
+class KeysetPage:
+    """A single page produced by KeysetPaginator"""
+    def __init__(self, items, next_cursor, previous_cursor):
+        self.object_list = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+
+class KeysetPaginator:
+    """
+    Seek-method paginator keyed on (created_at, id).
+
+    Every page is a bounded range scan on a matching composite index, so the
+    cost of a page does not depend on how deep the client has scrolled.
+    """
+    def __init__(self, queryset, page_size, time_field='created_at',
+                 id_field='id', descending=True):
+        self.queryset = queryset
+        self.page_size = page_size
+        self.time_field = time_field
+        self.id_field = id_field
+        self.descending = descending
+
+    def position(self, item):
+        """Return the (timestamp, id) key of an item or values() row"""
+        if isinstance(item, dict):
+            return (item[self.time_field], item[self.id_field])
+        return (getattr(item, self.time_field), getattr(item, self.id_field))
+
+    def _ordered(self, descending):
+        prefix = '-' if descending else ''
+        return self.queryset.order_by(
+            f'{prefix}{self.time_field}', f'{prefix}{self.id_field}'
+        )
+
+    def _beyond(self, position, op):
+        timestamp, pk = position
+        return (
+            Q(**{f'{self.time_field}__{op}': timestamp})
+            | Q(**{self.time_field: timestamp, f'{self.id_field}__{op}': pk})
+        )
+
+    def window(self, position, descending, keys_only=False):
+        """
+        Return up to page_size + 1 (key, row) pairs strictly after position.
+
+        With keys_only only the key columns are read and rows are None.
+        """
+        queryset = self._window_queryset(position, descending)
+        if keys_only:
+            keys = queryset.values_list(self.time_field, self.id_field)
+            return [(tuple(key), None) for key in keys[:self.page_size + 1]]
+        return [(self.position(item), item) for item in queryset[:self.page_size + 1]]
+
+    async def awindow(self, position, descending):
+        """Async version of window(), always reading full rows"""
+        queryset = self._window_queryset(position, descending)
+        return [(self.position(item), item) async for item in queryset[:self.page_size + 1]]
+
+    def _window_queryset(self, position, descending):
+        queryset = self._ordered(descending)
+        if position is not None:
+            queryset = queryset.filter(self._beyond(position, 'lt' if descending else 'gt'))
+        return queryset
+
+    def between(self, first, last):
+        """Return a lazy queryset of rows from first to last key, inclusive"""
+        lower, upper = (last, first) if self.descending else (first, last)
+        timestamp_low, pk_low = lower
+        timestamp_high, pk_high = upper
+        return self._ordered(self.descending).filter(
+            Q(**{f'{self.time_field}__gt': timestamp_low})
+            | Q(**{self.time_field: timestamp_low, f'{self.id_field}__gte': pk_low}),
+            Q(**{f'{self.time_field}__lt': timestamp_high})
+            | Q(**{self.time_field: timestamp_high, f'{self.id_field}__lte': pk_high}),
+        )
+
+    def parse(self, token):
+        """Decode a cursor token into ((timestamp, id), reverse)"""
+        payload = decode_cursor(token)
+        timestamp = parse_datetime(str(payload.get('t', '')))
+        pk = payload.get('i')
+        if timestamp is None or not isinstance(pk, int):
+            raise InvalidCursor(token)
+        return (timestamp, pk), bool(payload.get('r'))
+
+    def page(self, cursor=None, lazy=False):
+        """
+        Return the page that starts at cursor (or the first page).
+
+        With lazy=True only the keys are read up front and object_list is an
+        unevaluated queryset over the page's key range, suitable for
+        streaming with .iterator().
+        """
+        position, reverse = self.parse(cursor) if cursor else (None, False)
+        rows = self.window(position, self.descending != reverse, keys_only=lazy)
+        return self._page_from_window(rows, position, reverse, lazy)
+
+    async def apage(self, cursor=None):
+        """Async version of page(); object_list is always a list"""
+        position, reverse = self.parse(cursor) if cursor else (None, False)
+        rows = await self.awindow(position, self.descending != reverse)
+        return self._page_from_window(rows, position, reverse, lazy=False)
+
+    def _page_from_window(self, rows, position, reverse, lazy):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        if not rows:
+            return KeysetPage([], None, None)
+
+        if lazy:
+            items = self.between(rows[0][0], rows[-1][0])
+        else:
+            items = [item for _, item in rows]
+
+        return KeysetPage(
+            items,
+            _encode_position(rows[-1][0], reverse=False) if has_next else None,
+            _encode_position(rows[0][0], reverse=True) if has_previous else None,
+        )
+
+
+class MergedKeysetPaginator(KeysetPaginator):
+    """
+    Keyset paginator over several sources that share one (timestamp, id) key
+    space, e.g. a materialized timeline plus posts read on demand.
+    """
+    def __init__(self, paginators, page_size, descending=True):
+        super().__init__(None, page_size, descending=descending)
+        self.paginators = paginators
+
+    def window(self, position, descending, keys_only=False):
+        rows = []
+        for paginator in self.paginators:
+            paginator.page_size = self.page_size
+            rows.extend(paginator.window(position, descending, keys_only))
+        rows.sort(key=lambda row: row[0], reverse=descending)
+
+        # The same post can reach a member through more than one source.
+        unique = []
+        for row in rows:
+            if not unique or unique[-1][0] != row[0]:
+                unique.append(row)
+        return unique[:self.page_size + 1]
+
+
+def _encode_position(position, reverse):
+    timestamp, pk = position
+    return encode_cursor({'t': timestamp.isoformat(), 'i': pk, 'r': int(reverse)})
@@ -0,0 +1,18 @@
+import time
+
+from rest_framework.renderers import JSONRenderer
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that records how long rendering took on the underlying
+    HttpRequest, for the Server-Timing header added by RequestTimingMiddleware
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        started = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            request = (renderer_context or {}).get('request')
+            if request is not None:
+                request._request.render_duration = time.perf_counter() - started
@@ -0,0 +1,84 @@
+import re
+
+from django.db import connection
+from django.utils.html import escape
+
+from api.models import Post
+from api.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+SNIPPET_TOKENS = 12
+
+# Private-use characters marking matches in raw snippets; they are turned
+# into <mark> tags only after the post text around them is escaped
+MATCH_START = '\ue000'
+MATCH_END = '\ue001'
+
+SEARCH_SQL = """
+    SELECT id, score, snippet FROM (
+        SELECT
+            rowid AS id,
+            bm25(post_fts) AS score,
+            snippet(post_fts, 0, %s, %s, '…', %s) AS snippet
+        FROM post_fts
+        WHERE post_fts MATCH %s
+    )
+    {seek}
+    ORDER BY score, id
+    LIMIT %s
+"""
+
+
+def build_match_query(text):
+    """
+    Turn free text into a safe FTS5 query matching posts that contain every
+    word. Words are quoted so FTS syntax in user input is matched literally.
+    Prefix matching is deliberately not offered: a short prefix expands to
+    thousands of terms and turns a millisecond lookup into a scan.
+    """
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    return ' '.join(f'"{word}"' for word in words)
+
+
+def search_posts(text, page_size, cursor=None):
+    """
+    Return (posts, snippets, next_cursor) for a full-text query.
+
+    Results are ordered by bm25 relevance, best first, and paginated with a
+    (score, id) keyset cursor. snippets maps post id to highlighted text.
+    """
+    match = build_match_query(text)
+    if match is None:
+        return [], {}, None
+
+    params = [MATCH_START, MATCH_END, SNIPPET_TOKENS, match]
+    seek = ''
+    if cursor:
+        payload = decode_cursor(cursor)
+        score, pk = payload.get('s'), payload.get('i')
+        if not isinstance(score, (int, float)) or not isinstance(pk, int):
+            raise InvalidCursor(cursor)
+        seek = 'WHERE score > %s OR (score = %s AND id > %s)'
+        params += [score, score, pk]
+    params.append(page_size + 1)
+
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(SEARCH_SQL.format(seek=seek), params)
+        rows = db_cursor.fetchall()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last_id, last_score, _ = rows[-1]
+        next_cursor = encode_cursor({'s': last_score, 'i': last_id})
+
+    posts = Post.objects.select_related('author').order_by().in_bulk([row[0] for row in rows])
+    ordered = [posts[post_id] for post_id, _, _ in rows if post_id in posts]
+    snippets = {post_id: highlight(snippet) for post_id, _, snippet in rows}
+    return ordered, snippets, next_cursor
+
+
+def highlight(snippet):
+    """Return a raw snippet as HTML: the text escaped, matches in <mark>"""
+    return escape(snippet).replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>')
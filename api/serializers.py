@@ -1,5 +1,16 @@
-from rest_framework import serializers
+from functools import partial
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import models
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from api.hashing import run_hashing
+from api.loaders import load_liked_post_ids
 from api.models import Member, Post, Comment, Like
+from api.pagination import KeysetPaginator
 
 
 class MemberSerializer(serializers.ModelSerializer):
@@ -22,7 +33,7 @@ class MemberRegistrationSerializer(serializers.ModelSerializer):
         """Create a new member with hashed password"""
         password = validated_data.pop('password')
         member = Member(**validated_data)
-        member.set_password(password)
+        run_hashing(member.set_password, password)
         member.save()
         return member
 
@@ -47,28 +58,223 @@ class PostCreateSerializer(serializers.ModelSerializer):
         fields = ['content']
 
 
-class PostSerializer(serializers.ModelSerializer):
+class InvalidFields(ValueError):
+    """Raised when `?fields=` or `?expand=` names a field that does not exist"""
+
+
+def parse_field_selection(fields, expand=''):
+    """
+    Parse `?fields=` and `?expand=` into a selection: a dict mapping field
+    names to the selection inside that field, None meaning all of it.
+
+    Dotted names select inside nested objects (`author.username`), and
+    `expand` names nested objects to include whole alongside `fields`.
+    Returns None, selecting everything, when fields names nothing (`fields=`
+    or `fields=,`).
+    """
+    if not fields:
+        return None
+    selection = {}
+    for path in fields.split(',') + expand.split(','):
+        path = path.strip()
+        if path:
+            _add_path(selection, path.split('.'))
+    return selection or None
+
+
+def _add_path(selection, names):
+    name, rest = names[0], [part for part in names[1:] if part]
+    if not rest:
+        selection[name] = None
+    elif selection.get(name, {}) is not None:
+        _add_path(selection.setdefault(name, {}), rest)
+
+
+def is_selected(selection, name):
+    """Whether selection renders field name"""
+    return selection is None or name in selection
+
+
+class SparseFieldsMixin:
+    """
+    Render only the fields picked by the selection in context['fields'], as
+    parsed by parse_field_selection(); without one every field is rendered.
+
+    select_columns() narrows a queryset to what a selection reads, so
+    unrequested columns and joins are never fetched.
+    """
+    # Serializers rendering fields that are not nested serializers
+    # themselves, for selecting inside them
+    nested_serializers = {}
+    # Columns read whatever is selected
+    required_columns = ('id',)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.context.get('fields')
+        if selection is None:
+            return fields
+        selected = {}
+        for name, field in fields.items():
+            if name not in selection:
+                continue
+            if selection[name] is not None and isinstance(field, serializers.Serializer):
+                for child in list(field.fields):
+                    if child not in selection[name]:
+                        field.fields.pop(child)
+            selected[name] = field
+        return selected
+
+    @classmethod
+    def field_columns(cls):
+        """
+        Return (columns, nested): the model columns each field reads, and
+        for nested serializers the relation and the column of each of their
+        fields. Built once per class.
+        """
+        if '_field_columns' not in cls.__dict__:
+            columns, nested = {}, {}
+            for name, field in cls().fields.items():
+                if isinstance(field, serializers.Serializer):
+                    columns[name] = ()
+                    nested[name] = (field.source, {
+                        child.field_name: f'{field.source}__{child.source}'
+                        for child in field.fields.values()
+                    })
+                elif isinstance(field, serializers.SerializerMethodField):
+                    columns[name] = ()
+                else:
+                    columns[name] = (field.source,)
+            cls._field_columns = (columns, nested)
+        return cls._field_columns
+
+    @classmethod
+    def validate_selection(cls, selection, prefix=''):
+        """Raise InvalidFields unless every field in selection exists"""
+        if selection is None:
+            return
+        columns, nested = cls.field_columns()
+        for name, inner in selection.items():
+            path = f'{prefix}{name}'
+            if name not in columns:
+                raise InvalidFields(f'Unknown field: {path}')
+            if inner is None:
+                continue
+            if name in cls.nested_serializers:
+                cls.nested_serializers[name].validate_selection(inner, f'{path}.')
+            elif name not in nested:
+                raise InvalidFields(f'Field has no fields to select: {path}')
+            else:
+                for child, child_inner in inner.items():
+                    if child not in nested[name][1]:
+                        raise InvalidFields(f'Unknown field: {path}.{child}')
+                    if child_inner is not None:
+                        raise InvalidFields(f'Field has no fields to select: {path}.{child}')
+
+    @classmethod
+    def selected_columns(cls, selection):
+        """Return the model columns rendering selection reads, as only()/values() paths"""
+        columns, nested = cls.field_columns()
+        selected = list(cls.required_columns)
+        for name in columns:
+            if not is_selected(selection, name):
+                continue
+            selected.extend(columns[name])
+            if name in nested:
+                relation, child_columns = nested[name]
+                inner = None if selection is None else selection[name]
+                selected.append(f'{relation}__id')
+                selected.extend(
+                    column for child, column in child_columns.items()
+                    if is_selected(inner, child)
+                )
+        return list(dict.fromkeys(selected))
+
+    @classmethod
+    def select_columns(cls, queryset, selection):
+        """
+        Restrict queryset to the columns rendering selection reads, joining
+        only the relations of selected nested objects
+        """
+        if selection is None:
+            return queryset
+        _, nested = cls.field_columns()
+        relations = [relation for name, (relation, _) in nested.items() if name in selection]
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*cls.selected_columns(selection))
+
+
+class SideloadedAuthorMixin:
+    """
+    When the context carries a `members` dict (`?sideload=members`), render
+    the author as `author_id` and collect each distinct author into that
+    dict once, instead of nesting the member in every item.
+    """
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get('members') is None or 'author' not in fields:
+            return fields
+        # Kept to render the members, with the fields selected for them
+        self._author_serializer = fields['author']
+        return {
+            ('author_id' if name == 'author' else name):
+                (serializers.IntegerField(read_only=True) if name == 'author' else field)
+            for name, field in fields.items()
+        }
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        members = self.context.get('members')
+        if members is not None and 'author_id' in data and instance.author_id not in members:
+            members[instance.author_id] = self._author_serializer.to_representation(instance.author)
+        return data
+
+
+class PostListSerializer(serializers.ListSerializer):
+    """List serializer that resolves is_liked for the whole page at once"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._liked_post_ids_given = 'liked_post_ids' in self.context
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        posts = list(iterable)
+
+        if not self._liked_post_ids_given and 'is_liked' in self.child.fields:
+            request = self.context.get('request')
+            member = getattr(request, 'user', None) if request else None
+            self._context = {
+                **self.context,
+                'liked_post_ids': load_liked_post_ids(member, [post.id for post in posts]),
+            }
+
+        return [self.child.to_representation(post) for post in posts]
+
+
+class PostSerializer(SideloadedAuthorMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for displaying post information"""
     author = MemberSerializer(read_only=True)
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
     is_liked = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
         fields = ['id', 'author', 'content', 'created_at', 'updated_at', 'likes_count', 'comments_count', 'is_liked']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        list_serializer_class = PostListSerializer
 
-    def get_likes_count(self, obj):
-        """Get the number of likes for the post"""
-        return obj.likes.count()
-
-    def get_comments_count(self, obj):
-        """Get the number of comments for the post"""
-        return obj.comments.count()
+    # Lists are paginated on (created_at, id), and posts read through
+    # member.posts are given the member they belong to by author_id
+    required_columns = ('id', 'created_at', 'author')
 
     def get_is_liked(self, obj):
         """Check if the current user has liked the post"""
+        liked_post_ids = self.context.get('liked_post_ids')
+        if liked_post_ids is not None:
+            return obj.id in liked_post_ids
         request = self.context.get('request')
         if request and hasattr(request, 'user') and request.user:
             return Like.objects.filter(post=obj, member=request.user).exists()
@@ -82,27 +288,305 @@ class CommentCreateSerializer(serializers.ModelSerializer):
         fields = ['content']
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SideloadedAuthorMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for displaying comment information"""
     author = MemberSerializer(read_only=True)
-    post_id = serializers.IntegerField(source='post.id', read_only=True)
+    post_id = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Comment
         fields = ['id', 'author', 'content', 'post_id', 'created_at']
         read_only_fields = ['id', 'created_at']
 
+    # Lists are paginated on (created_at, id)
+    required_columns = ('id', 'created_at')
 
-class ProfileSerializer(serializers.ModelSerializer):
-    """Serializer for user profile with posts"""
+
+class ProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Serializer for user profile with the first page of posts.
+
+    Further pages are served by /api/profile/{id}/posts/ starting at
+    `posts_next`. Pass a precomputed KeysetPage as `posts_page` in the
+    context to reuse it. Fields of the posts are selected as `posts.<field>`.
+    """
     posts = serializers.SerializerMethodField()
+    posts_next = serializers.SerializerMethodField()
+
+    nested_serializers = {'posts': PostSerializer}
 
     class Meta:
         model = Member
-        fields = ['id', 'email', 'username', 'first_name', 'last_name', 'bio', 'avatar_url', 'created_at', 'posts']
+        fields = ['id', 'email', 'username', 'first_name', 'last_name', 'bio', 'avatar_url', 'created_at', 'posts', 'posts_next']
         read_only_fields = ['id', 'created_at']
 
+    @classmethod
+    def select_columns(cls, queryset, selection):
+        # Posts read through member.posts take their author from the member
+        # itself, so it is loaded whole whenever they are rendered
+        if is_selected(selection, 'posts'):
+            return queryset
+        return super().select_columns(queryset, selection)
+
+    @staticmethod
+    def posts_selection(selection):
+        """
+        Return the selection of post fields within a profile selection,
+        empty when posts are not rendered, so that only their keys are read
+        """
+        return None if selection is None else selection.get('posts', {})
+
+    def get_posts_page(self, obj):
+        page = self.context.get('posts_page')
+        if page is None:
+            posts = PostSerializer.select_columns(
+                obj.posts.all(),
+                self.posts_selection(self.context.get('fields'))
+            )
+            page = KeysetPaginator(posts, settings.PROFILE_POSTS_PAGE_SIZE).page()
+            self._context = {**self.context, 'posts_page': page}
+        return page
+
     def get_posts(self, obj):
-        """Get all posts by the user"""
-        posts = obj.posts.all()
-        return PostSerializer(posts, many=True, context=self.context).data
+        """Get the most recent posts by the user"""
+        page = self.get_posts_page(obj)
+        context = {**self.context, 'fields': self.posts_selection(self.context.get('fields'))}
+        return PostSerializer(page.object_list, many=True, context=context).data
+
+    def get_posts_next(self, obj):
+        """Get the link to the next page of the user's posts"""
+        page = self.get_posts_page(obj)
+        if page.next_cursor is None:
+            return None
+        return f"{reverse('profile-posts', args=[obj.id])}?cursor={page.next_cursor}"
+
+
+# values()-based fast path for list endpoints. These build the same dicts as
+# PostSerializer/CommentSerializer (same keys, order and formatting) straight
+# from values() rows, skipping per-row field objects and nested serializers.
+# api/tests.py checks that both paths render byte-identical JSON.
+
+MEMBER_FIELDS = MemberSerializer.Meta.fields
+
+
+def _datetime_formatter():
+    """
+    Return a function formatting datetimes like serializers.DateTimeField.
+
+    The field looks up the current timezone for every value, which dominates
+    the cost of a page; here it is resolved once per page.
+    """
+    field = serializers.DateTimeField()
+    if (api_settings.DATETIME_FORMAT or '').lower() != ISO_8601:
+        return lambda value: None if value is None else field.to_representation(value)
+
+    current_timezone = field.default_timezone()
+
+    def format_datetime(value):
+        if value is None:
+            return None
+        if current_timezone is not None and timezone.is_aware(value):
+            value = value.astimezone(current_timezone)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return format_datetime
+
+
+def _member_from_row(row, format_datetime):
+    return {
+        'id': row['author__id'],
+        'email': row['author__email'],
+        'username': row['author__username'],
+        'first_name': row['author__first_name'],
+        'last_name': row['author__last_name'],
+        'bio': row['author__bio'],
+        'avatar_url': row['author__avatar_url'],
+        'created_at': format_datetime(row['author__created_at']),
+    }
+
+
+def _selected_member_builder(selection, format_datetime):
+    """Return a function building a member with the fields selection picks from a row"""
+    fields = [field for field in MEMBER_FIELDS if is_selected(selection, field)]
+    # A trailing key keeps the getter returning a tuple even for one field;
+    # zip() stops before it
+    values = itemgetter(*(f'author__{field}' for field in fields), 'author__id')
+    format_created_at = 'created_at' in fields
+
+    def member(row):
+        data = dict(zip(fields, values(row)))
+        if format_created_at:
+            data['created_at'] = format_datetime(data['created_at'])
+        return data
+    return member
+
+
+def _author_field(context, selection, format_datetime):
+    """
+    Return the author key and a function building its value from a row: the
+    nested member with the fields selection picks, or with a `members` dict
+    in the context (sideloading) the author id, collecting the member into
+    that dict
+    """
+    if selection is None:
+        member = partial(_member_from_row, format_datetime=format_datetime)
+    else:
+        member = _selected_member_builder(selection, format_datetime)
+
+    members = context.get('members')
+    if members is None:
+        return 'author', member
+
+    def author_id(row):
+        member_id = row['author__id']
+        if member_id not in members:
+            members[member_id] = member(row)
+        return member_id
+    return 'author_id', author_id
+
+
+class RowListSerializer:
+    """
+    Minimal stand-in for a `many=True` DRF serializer over values() rows:
+    supports `.data` and `.to_representation(rows)`, which is all that
+    list_response and StreamingListResponse use.
+
+    With a selection in context['fields'] only the picked fields of
+    `serializer_class` are rendered, and rows() reads only their columns.
+    """
+    serializer_class = None
+    datetime_fields = ()
+
+    def __init__(self, instance=None, many=True, context=None):
+        self.instance = instance
+        self.context = context or {}
+
+    @classmethod
+    def rows(cls, queryset, selection=None):
+        """Return queryset as the values() rows rendering selection reads"""
+        return queryset.values(*cls.serializer_class.selected_columns(selection))
+
+    @property
+    def data(self):
+        return self.to_representation(self.instance)
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        format_datetime = _datetime_formatter()
+        selection = self.context.get('fields')
+        if selection is None:
+            return self.render(rows, format_datetime)
+        return self.render_selected(rows, selection, format_datetime)
+
+    def render(self, rows, format_datetime):
+        """
+        Render every field. Subclasses override this with dict literals,
+        the fastest way to build them.
+        """
+        return self.render_selected(
+            rows,
+            dict.fromkeys(self.serializer_class.Meta.fields),
+            format_datetime
+        )
+
+    def column(self, name, selection, rows, format_datetime):
+        """
+        Return (key, source, convert) for field name: its value is the row's
+        source column passed through convert, if any, or with no source
+        convert(row). selection is the selection inside the field.
+        """
+        if name == 'author':
+            key, author = _author_field(self.context, selection, format_datetime)
+            return key, None, author
+        if name in self.datetime_fields:
+            return name, name, format_datetime
+        return name, name, None
+
+    def render_selected(self, rows, selection, format_datetime):
+        """Render the fields selection picks"""
+        columns = [
+            self.column(name, selection[name], rows, format_datetime)
+            for name in self.serializer_class.Meta.fields
+            if name in selection
+        ]
+        if not columns:
+            return [{} for _ in rows]
+        keys = [key for key, _, _ in columns]
+        # Source columns are all copied with one getter call per row, in key
+        # order; computed values fill in their placeholders afterwards. The
+        # trailing key keeps the getter returning a tuple.
+        values = itemgetter(*(source or 'id' for _, source, _ in columns), 'id')
+        converted = [(key, convert) for key, source, convert in columns if source and convert]
+        computed = [(key, convert) for key, source, convert in columns if not source]
+        items = []
+        for row in rows:
+            item = dict(zip(keys, values(row)))
+            for key, convert in converted:
+                item[key] = convert(item[key])
+            for key, convert in computed:
+                item[key] = convert(row)
+            items.append(item)
+        return items
+
+
+class PostRowSerializer(RowListSerializer):
+    """values() fast path producing PostSerializer(many=True) output"""
+    serializer_class = PostSerializer
+    datetime_fields = ('created_at', 'updated_at')
+
+    def liked_post_ids(self, rows):
+        liked_post_ids = self.context.get('liked_post_ids')
+        if liked_post_ids is None:
+            request = self.context.get('request')
+            member = getattr(request, 'user', None) if request else None
+            liked_post_ids = load_liked_post_ids(member, [row['id'] for row in rows])
+        return liked_post_ids
+
+    def render(self, rows, format_datetime):
+        liked_post_ids = self.liked_post_ids(rows)
+        author_key, author = _author_field(self.context, None, format_datetime)
+        return [
+            {
+                'id': row['id'],
+                author_key: author(row),
+                'content': row['content'],
+                'created_at': format_datetime(row['created_at']),
+                'updated_at': format_datetime(row['updated_at']),
+                'likes_count': row['likes_count'],
+                'comments_count': row['comments_count'],
+                'is_liked': row['id'] in liked_post_ids,
+            }
+            for row in rows
+        ]
+
+    def column(self, name, selection, rows, format_datetime):
+        if name == 'is_liked':
+            return name, 'id', self.liked_post_ids(rows).__contains__
+        return super().column(name, selection, rows, format_datetime)
+
+
+class CommentRowSerializer(RowListSerializer):
+    """values() fast path producing CommentSerializer(many=True) output"""
+    serializer_class = CommentSerializer
+    datetime_fields = ('created_at',)
+
+    def render(self, rows, format_datetime):
+        author_key, author = _author_field(self.context, None, format_datetime)
+        return [
+            {
+                'id': row['id'],
+                author_key: author(row),
+                'content': row['content'],
+                'post_id': row['post_id'],
+                'created_at': format_datetime(row['created_at']),
+            }
+            for row in rows
+        ]
+
+
+FAST_LIST_SERIALIZERS = {
+    PostSerializer: PostRowSerializer,
+    CommentSerializer: CommentRowSerializer,
+}
@@ -0,0 +1,62 @@
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from api.authentication import member_cache
+from api.caching import bump, member_scope
+from api.changes import record_changes
+from api.jobs import enqueue
+from api.models import Member, Post, Like, Comment, Follow, Change, shifted
+
+
+@receiver(pre_delete, sender=Member)
+def release_member_counters(sender, instance, **kwargs):
+    """
+    Decrement counters on posts the member liked or commented on, and on
+    members they follow, before the cascade removes those rows. Both those
+    posts and the member's own, which the cascade deletes, go into the change
+    log so feed clients pick them up, and the likes, comments and timeline
+    entries of the member's posts are purged in the background.
+    """
+    likes = (
+        Like.objects.filter(member=instance)
+        .exclude(post__author=instance)
+        .values('post_id')
+        .annotate(n=Count('id'))
+    )
+    for row in likes:
+        Post.adjust_counters(row['post_id'], likes=-row['n'])
+
+    comments = (
+        Comment.objects.filter(author=instance)
+        .exclude(post__author=instance)
+        .values('post_id')
+        .annotate(n=Count('id'))
+    )
+    for row in comments:
+        Post.adjust_counters(row['post_id'], comments=-row['n'])
+
+    record_changes(
+        Change.POST_UPDATED,
+        sorted({row['post_id'] for row in likes} | {row['post_id'] for row in comments})
+    )
+    own_post_ids = list(Post.objects.filter(author=instance).order_by('id').values_list('id', flat=True))
+    record_changes(Change.POST_DELETED, own_post_ids)
+    for post_id in own_post_ids:
+        enqueue('purge_deleted_post', post_id=post_id)
+
+    Member.objects.filter(
+        id__in=Follow.objects.filter(follower=instance).values('followee_id')
+    ).update(followers_count=shifted('followers_count', -1))
+
+
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+def invalidate_cached_member(sender, instance, **kwargs):
+    """
+    Drop the member from this worker's authentication cache, bump its scope
+    so other workers drop theirs, and invalidate cached responses that embed
+    member details.
+    """
+    member_cache.invalidate(instance.id)
+    bump('posts', 'members', member_scope(instance.id))
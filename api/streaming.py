@@ -0,0 +1,59 @@
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+STREAM_CHUNK_SIZE = 200
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class StreamingListResponse(StreamingHttpResponse):
+    """
+    Stream a list envelope such as {'count', 'next', 'previous', 'results'}.
+
+    The rows under `items_key` are read with .iterator(chunk_size=...) and
+    serialized one chunk at a time, so memory stays flat however many rows
+    the response holds. `trailer`, if given, is called once the rows are
+    written and returns keys to append after them, such as data collected
+    while serializing. The bytes produced are identical to rendering the
+    fully built envelope with DRF's JSONRenderer.
+    """
+    def __init__(self, envelope, items, serializer_class, context=None,
+                 items_key='results', chunk_size=STREAM_CHUNK_SIZE, status=200,
+                 trailer=None):
+        super().__init__(
+            self._render(envelope, items, serializer_class, context or {},
+                         items_key, chunk_size, trailer),
+            content_type=JSONRenderer.media_type,
+            status=status
+        )
+
+    @staticmethod
+    def _render(envelope, items, serializer_class, context, items_key, chunk_size, trailer):
+        renderer = JSONRenderer()
+
+        head = renderer.render({**envelope, items_key: []})
+        yield head[:-2]
+
+        if hasattr(items, 'iterator'):
+            items = items.iterator(chunk_size=chunk_size)
+
+        # One list serializer is reused for every chunk; building a new one per
+        # chunk leaves reference cycles behind that only a full GC reclaims.
+        serializer = serializer_class(many=True, context=context)
+        separator = b''
+        for chunk in _chunks(items, chunk_size):
+            data = serializer.to_representation(chunk)
+            yield separator + b','.join(renderer.render(item) for item in data)
+            separator = b','
+
+        if trailer is None:
+            yield head[-2:]
+        else:
+            # '{"key":...}' continues the envelope after the closing ']'
+            yield b'],' + renderer.render(trailer())[1:]
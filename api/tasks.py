@@ -0,0 +1,31 @@
+from api.changes import trim_change_log
+from api.jobs import task
+from api.models import Post, purge_post_activity
+from api.timeline import deliver_to_followers, purge_post_timeline
+
+
+@task
+def fan_out_post(post_id):
+    """Deliver a post to its author's followers, unless it was deleted since"""
+    post = Post.objects.select_related('author').filter(id=post_id).first()
+    if post is not None:
+        deliver_to_followers(post)
+
+
+@task
+def purge_deleted_post(post_id):
+    """Remove the timeline entries, likes and comments a post deletion left behind"""
+    purge_post_timeline(post_id)
+    purge_post_activity(post_id)
+
+
+@task
+def reconcile_counters(post_ids=None):
+    """Fix drifted like/comment counters on the given posts, or on all posts"""
+    Post.reconcile_counters(post_ids)
+
+
+@task
+def purge_change_log():
+    """Trim the change log to CHANGE_LOG_MAX_ENTRIES entries"""
+    trim_change_log()
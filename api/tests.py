@@ -1,3 +1,1200 @@
-from django.test import TestCase
+import importlib
+import json
+import tempfile
+import time
+from types import ModuleType, SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.core import signing
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api import jobs
+from api.authentication import (
+    SESSION_COOKIE_NAME,
+    issue_session_token,
+    member_cache,
+    read_session_token
+)
+from api.caching import DISABLED_CACHES, bump, post_scope
+from api.changes import latest_cursor, record_change, trim_change_log
+from api.models import Member, Post, Like, Comment, Job, Change, Follow, TimelineEntry
+from api.pagination import encode_cursor
+from api.streaming import STREAM_CHUNK_SIZE
+from api.serializers import (
+    PostSerializer,
+    CommentSerializer,
+    PostRowSerializer,
+    CommentRowSerializer,
+    RowListSerializer,
+    _datetime_formatter
+)
+from api.throttling import TokenBucketThrottle
+from api.timeline import deliver_to_author
+
+
+def create_member(username, **fields):
+    """Create a member whose email and names are derived from username"""
+    return Member.objects.create(
+        email=f'{username}@example.com', username=username,
+        first_name=username.capitalize(), last_name=username[0].upper(),
+        **fields,
+    )
+
+
+def create_posts(author, *contents):
+    """Create one post by author per content, oldest first"""
+    return [Post.objects.create(author=author, content=content) for content in contents]
+
+
+def member_client(member):
+    """APIClient authenticated as member"""
+    client = APIClient()
+    client.force_authenticate(member)
+    return client
+
+
+def async_member_client(member):
+    """AsyncClient carrying member's session cookie"""
+    client = AsyncClient()
+    client.cookies[SESSION_COOKIE_NAME] = issue_session_token(member)
+    return client
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False)
+class FastListSerializationTests(TestCase):
+    """
+    Golden-output checks: the values() fast path must render exactly the
+    bytes the model serializers render.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = Member.objects.create(
+            email='viewer@example.com', username='viewer',
+            first_name='Viewer', last_name='V',
+        )
+        cls.author = Member.objects.create(
+            email='author@example.com', username='author',
+            first_name='Ädam', last_name='"Quoted"',
+            bio='Line one\nline two', avatar_url='https://example.com/a.png',
+        )
+        cls.posts = [
+            Post.objects.create(author=author, content=content)
+            for author, content in [
+                (cls.author, 'Hello, world'),
+                (cls.viewer, 'Ünïcode ✓ and "quotes"'),
+                (cls.author, ''),
+                (cls.author, 'x' * 500),
+            ]
+        ]
+        Like.objects.create(member=cls.viewer, post=cls.posts[0])
+        Like.objects.create(member=cls.viewer, post=cls.posts[2])
+        Post.objects.filter(id=cls.posts[0].id).update(likes_count=1, comments_count=2)
+        Post.objects.filter(id=cls.posts[2].id).update(likes_count=1)
+        for content in ['First', 'Second ✓']:
+            Comment.objects.create(author=cls.author, post=cls.posts[0], content=content)
+        Comment.objects.create(author=cls.viewer, post=cls.posts[0], content='')
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_post_rows_match_post_serializer(self):
+        queryset = Post.objects.select_related('author')
+        for context in [
+            {'request': SimpleNamespace(user=self.viewer)},
+            {'request': SimpleNamespace(user=self.viewer), 'liked_post_ids': {self.posts[1].id}},
+            {},
+            {
+                'request': SimpleNamespace(user=self.viewer),
+                'fields': {'id': None, 'author': {'username': None, 'created_at': None}, 'is_liked': None},
+            },
+            {'fields': {'content': None, 'updated_at': None}},
+        ]:
+            with self.subTest(context=sorted(context)):
+                fields = context.get('fields')
+                expected = PostSerializer(
+                    PostSerializer.select_columns(queryset, fields), many=True, context=context
+                ).data
+                actual = PostRowSerializer(
+                    PostRowSerializer.rows(queryset, fields), context=context
+                ).data
+                self.assertEqual(self.render(actual), self.render(expected))
+
+    def test_comment_rows_match_comment_serializer(self):
+        queryset = Comment.objects.filter(post=self.posts[0]).select_related('author')
+        expected = CommentSerializer(queryset, many=True).data
+        actual = CommentRowSerializer(CommentRowSerializer.rows(queryset)).data
+        self.assertEqual(self.render(actual), self.render(expected))
+
+    def test_literal_render_matches_generic_render(self):
+        context = {'request': SimpleNamespace(user=self.viewer)}
+        for serializer_class, queryset in [
+            (PostRowSerializer, Post.objects.all()),
+            (CommentRowSerializer, Comment.objects.all()),
+        ]:
+            with self.subTest(serializer=serializer_class.__name__):
+                rows = list(serializer_class.rows(queryset))
+                serializer = serializer_class(rows, context=context)
+                expected = RowListSerializer.render(serializer, rows, _datetime_formatter())
+                self.assertEqual(self.render(serializer.data), self.render(expected))
+
+    def test_list_endpoints_match(self):
+        client = APIClient()
+        client.force_authenticate(self.viewer)
+        post_id = self.posts[0].id
+        urls = [
+            reverse('posts-list') + '?page_size=3',
+            reverse('posts-list') + '?page=2&page_size=3',
+            reverse('posts-list') + '?cursor=&page_size=3&count=exact',
+            reverse('profile-posts', args=[self.author.id]) + '?page_size=2',
+            reverse('comments-list', args=[post_id]) + '?page_size=2',
+            reverse('posts-list') + '?cursor=&page_size=3&sideload=members',
+            reverse('profile-posts', args=[self.author.id]) + '?page_size=2&sideload=members',
+            reverse('comments-list', args=[post_id]) + '?sideload=members',
+            reverse('posts-list') + '?page_size=3&fields=id,content,author.username,likes_count',
+            reverse('posts-list') + '?cursor=&fields=id,is_liked&expand=author',
+            reverse('profile-posts', args=[self.author.id]) + '?fields=content,created_at',
+            reverse('comments-list', args=[post_id]) + '?fields=author.avatar_url,post_id',
+            reverse('posts-list') + '?cursor=&fields=id,author.username&sideload=members',
+        ]
+        for url in urls:
+            for stream in ['', '&stream=1']:
+                with self.subTest(url=url + stream):
+                    bodies = []
+                    for fast in [False, True]:
+                        with override_settings(FAST_LIST_SERIALIZATION=fast):
+                            response = client.get(url + stream)
+                        self.assertEqual(response.status_code, 200)
+                        if response.streaming:
+                            bodies.append(b''.join(response.streaming_content))
+                        else:
+                            bodies.append(response.content)
+                    self.assertEqual(bodies[1], bodies[0])
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False)
+class SideloadTests(TestCase):
+    """?sideload=members moves each author into a top-level `members` map"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = create_member('viewer')
+        cls.author = create_member('author', avatar_url='https://example.com/a.png')
+        cls.posts = create_posts(cls.author, 'One') + create_posts(cls.viewer, 'Two')
+        create_posts(cls.author, 'Three')
+        for author in [cls.author, cls.viewer, cls.author]:
+            Comment.objects.create(author=author, post=cls.posts[0], content='Comment')
+
+    def test_sideloaded_members_match_embedded_authors(self):
+        client = APIClient()
+        client.force_authenticate(self.viewer)
+
+        def get_json(url):
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            if response.streaming:
+                return json.loads(b''.join(response.streaming_content))
+            return response.json()
+
+        urls = [
+            reverse('posts-list') + '?page_size=10',
+            reverse('posts-list') + '?cursor=&page_size=10',
+            reverse('comments-list', args=[self.posts[0].id]) + '?page_size=10',
+            reverse('profile-posts', args=[self.author.id]) + '?page_size=10',
+        ]
+        for url in urls:
+            for stream in ['', '&stream=1']:
+                with self.subTest(url=url + stream):
+                    embedded = get_json(url + stream)
+                    sideloaded = get_json(url + stream + '&sideload=members')
+                    members = {}
+                    for item in embedded['results']:
+                        author = item.pop('author')
+                        item['author_id'] = author['id']
+                        members[str(author['id'])] = author
+                    self.assertEqual(sideloaded['results'], embedded['results'])
+                    self.assertEqual(sideloaded['members'], members)
+
+        profile = get_json(reverse('profile-detail', args=[self.author.id]) + '?sideload=members')
+        self.assertEqual({post['author_id'] for post in profile['posts']}, {self.author.id})
+        self.assertEqual(list(profile['members']), [str(self.author.id)])
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False)
+class SparseFieldsTests(TestCase):
+    """?fields= and ?expand= pick the rendered fields and the columns read"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = create_member('viewer')
+        cls.author = create_member('author', bio='Line one\nline two')
+        posts = create_posts(cls.author, 'One', 'Three')
+        create_posts(cls.viewer, 'Two')
+        Like.objects.create(member=cls.viewer, post=posts[0])
+        Post.objects.filter(id=posts[0].id).update(likes_count=1)
+
+    def test_sparse_fields_select_output_and_queries(self):
+        client = APIClient()
+        client.force_authenticate(self.viewer)
+        url = reverse('posts-list') + '?cursor=&page_size=10'
+
+        for fast in [False, True]:
+            with self.subTest(fast=fast), override_settings(FAST_LIST_SERIALIZATION=fast):
+                embedded = client.get(url).json()['results']
+                # One query for the page: no like lookup, no member join
+                with self.assertNumQueries(1):
+                    response = client.get(url + '&fields=id,content,likes_count')
+                self.assertEqual(response.json()['results'], [
+                    {'id': item['id'], 'content': item['content'], 'likes_count': item['likes_count']}
+                    for item in embedded
+                ])
+                response = client.get(url + '&fields=id,author.username')
+                self.assertEqual(response.json()['results'], [
+                    {'id': item['id'], 'author': {'username': item['author']['username']}}
+                    for item in embedded
+                ])
+
+        profile_url = reverse('profile-detail', args=[self.author.id])
+        with self.assertNumQueries(1):
+            response = client.get(profile_url + '?fields=username,bio')
+        self.assertEqual(response.json(), {'username': 'author', 'bio': 'Line one\nline two'})
+        profile = client.get(profile_url).json()
+        response = client.get(profile_url + '?fields=posts.id')
+        self.assertEqual(response.json(), {'posts': [{'id': post['id']} for post in profile['posts']]})
+
+        for fields in ['nope', 'author.nope', 'content.length', 'posts']:
+            with self.subTest(fields=fields):
+                response = client.get(url + '&fields=' + fields)
+                self.assertEqual(response.status_code, 400)
+
+    def test_blank_fields_select_everything(self):
+        client = member_client(self.viewer)
+        for url in [reverse('posts-list') + '?', reverse('posts-list') + '?cursor=&']:
+            expected = client.get(url).json()
+            for fast in [False, True]:
+                for fields in [',', ' , ', '&expand=']:
+                    with (
+                        self.subTest(url=url, fast=fast, fields=fields),
+                        override_settings(FAST_LIST_SERIALIZATION=fast),
+                    ):
+                        response = client.get(url + 'fields=' + fields)
+                        self.assertEqual(response.status_code, 200)
+                        self.assertEqual(response.json(), expected)
+
+        rows = PostRowSerializer.rows(Post.objects.all(), {})
+        self.assertEqual(PostRowSerializer(rows, context={'fields': {}}).data, [{}, {}, {}])
+
+
+def async_urlconf():
+    """The URLconf as served with DJANGO_ASYNC_VIEWS=1, to pass as ROOT_URLCONF"""
+    with override_settings(ASYNC_READ_VIEWS=True):
+        api_urls = importlib.reload(importlib.import_module('api.urls'))
+    patterns = api_urls.urlpatterns
+    importlib.reload(api_urls)
+    urlconf = ModuleType('async_urls')
+    urlconf.urlpatterns = [path('api/', include(patterns))]
+    return urlconf
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False)
+class BatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = create_member('member')
+        create_posts(cls.member, 'One', 'Two', 'Three')
+
+    def setUp(self):
+        self.client = member_client(self.member)
+
+    def batch(self, requests):
+        return self.client.post(reverse('batch'), {'requests': requests}, format='json')
+
+    def test_streamed_subrequests_with_async_views(self):
+        paths = ['/api/posts/?cursor=&page_size=2&stream=1', '/api/posts/?cursor=&page_size=2']
+        expected = self.batch([{'path': path} for path in paths]).json()
+        with override_settings(ROOT_URLCONF=async_urlconf()):
+            response = self.batch([{'path': path} for path in paths])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), expected)
+        streamed, buffered = expected['responses']
+        self.assertEqual(streamed['status'], 200)
+        self.assertEqual(streamed['body']['results'], buffered['body']['results'])
+
+    def test_malformed_subrequests_are_rejected(self):
+        malformed = [
+            'not-an-object',
+            {'path': 5},
+            {'path': '/api/posts/', 'method': 5},
+            {'path': '/api/posts/', 'method': 'POST'},
+            {'path': '/api/posts/', 'body': {'content': 'Hi'}},
+        ]
+        for item in malformed:
+            with self.subTest(item=item):
+                response = self.batch([{'path': '/api/posts/'}, item])
+                self.assertEqual(response.status_code, 400)
+                self.assertTrue(response.json()['error'].startswith('requests[1]: '))
+        response = self.batch([{'path': '/api/posts/', 'method': 'get', 'body': None}])
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False)
+class SearchTests(TestCase):
+    def test_snippet_escapes_post_html(self):
+        member = create_member('member')
+        create_posts(member, '<img src=x onerror="alert(1)"> fox & hound')
+        client = member_client(member)
+
+        response = client.get(reverse('posts-search') + '?q=fox')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()['results'][0]['snippet'],
+            '&lt;img src=x onerror=&quot;alert(1)&quot;&gt; <mark>fox</mark> &amp; hound'
+        )
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False)
+class PageSizeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = create_member('member')
+        for cls.post in create_posts(cls.member, 'One', 'Two', 'Three'):
+            deliver_to_author(cls.post)
+
+    def setUp(self):
+        self.client = member_client(self.member)
+
+    def test_invalid_page_size_is_rejected(self):
+        urls = [
+            reverse('posts-list') + '?',
+            reverse('posts-list') + '?cursor=&',
+            reverse('feed-home') + '?',
+            reverse('posts-search') + '?q=one&',
+            reverse('comments-list', args=[self.post.id]) + '?',
+            reverse('profile-posts', args=[self.member.id]) + '?',
+        ]
+        for url in urls:
+            for page_size in ['abc', '0', '-5', '']:
+                with self.subTest(url=url, page_size=page_size):
+                    response = self.client.get(url + 'page_size=' + page_size)
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(response.json(), {'error': 'Invalid page_size'})
+        with override_settings(ROOT_URLCONF=async_urlconf()):
+            for url in urls[1], urls[4]:
+                with self.subTest(url=url, async_views=True):
+                    response = self.client.get(url + 'page_size=abc')
+                    self.assertEqual(response.status_code, 400)
+
+    @override_settings(MAX_PAGE_SIZE=2)
+    def test_page_size_is_capped(self):
+        response = self.client.get(reverse('posts-list') + '?cursor=&page_size=50')
+        self.assertEqual(len(response.json()['results']), 2)
+        response = self.client.get(reverse('feed-home') + '?page_size=50&stream=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 2)
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False, REQUEST_TIMING_SAMPLE_RATE=1)
+class RequestTimingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = create_member('member')
+        create_posts(cls.member, 'One')
+
+    def server_timing(self, response):
+        return dict(
+            entry.split(';', 1) for entry in response['Server-Timing'].split(', ')
+        )
+
+    def test_sync_request_counts_queries(self):
+        response = member_client(self.member).get(reverse('posts-list') + '?cursor=')
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(self.server_timing(response)['db'], r'desc="[1-9]\d* queries"')
+
+    async def test_async_request_counts_queries(self):
+        client = async_member_client(self.member)
+        with override_settings(ROOT_URLCONF=async_urlconf()):
+            response = await client.get(reverse('posts-list') + '?cursor=')
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(self.server_timing(response)['db'], r'desc="[1-9]\d* queries"')
+        self.assertEqual(connection.execute_wrappers, [])
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=True)
+class MetricsMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = create_member('member')
+        create_posts(cls.member, 'One')
+
+    async def test_async_request_is_observed(self):
+        client = async_member_client(self.member)
+        with (
+            override_settings(ROOT_URLCONF=async_urlconf()),
+            mock.patch('api.middleware.observe_request') as observe_request,
+        ):
+            response = await client.get(reverse('posts-list') + '?cursor=')
+        self.assertEqual(response.status_code, 200)
+        view, method, status_code, _, queries = observe_request.call_args.args
+        self.assertEqual((view, method, status_code), ('AsyncPostListView', 'GET', 200))
+        self.assertGreater(queries, 0)
+        self.assertEqual(connection.execute_wrappers, [])
+
+
+class LikeToggleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_member('author')
+        cls.viewer = create_member('viewer')
+        [cls.post] = create_posts(cls.author, 'One')
+
+    def test_toggle_likes_then_unlikes(self):
+        Like.objects.create(member=self.author, post=self.post)
+        Post.objects.filter(id=self.post.id).update(likes_count=1)
+
+        self.assertEqual(Like.toggle(self.viewer.id, self.post.id), (True, 2))
+        self.assertTrue(Like.objects.filter(member=self.viewer, post=self.post).exists())
+        self.assertEqual(Like.toggle(self.viewer.id, self.post.id), (False, 1))
+        self.assertFalse(Like.objects.filter(member=self.viewer, post=self.post).exists())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(Like.objects.filter(post=self.post).count(), 1)
+
+    def test_toggle_missing_post(self):
+        self.assertIsNone(Like.toggle(self.viewer.id, self.post.id + 1000))
+        self.assertFalse(Like.objects.filter(member=self.viewer).exists())
+
+
+@override_settings(
+    CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle-tests',
+    }},
+    METRICS_ENABLED=False,
+)
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def login(self, email):
+        return self.client.post(
+            reverse('auth-login'), {'email': email, 'password': 'wrong'}, format='json'
+        )
+
+    def test_burst_then_429_until_refilled(self):
+        now = 1000.0
+        with mock.patch.object(TokenBucketThrottle, 'timer', side_effect=lambda: now):
+            for _ in range(5):
+                self.assertEqual(self.login('member@example.com').status_code, 401)
+            response = self.login('Member@Example.com ')
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response['Retry-After'], '12')
+            # Other accounts draw from their own bucket
+            self.assertEqual(self.login('other@example.com').status_code, 401)
+
+            # 5/min refills one token every 12 seconds
+            now += 12
+            self.assertEqual(self.login('member@example.com').status_code, 401)
+            self.assertEqual(self.login('member@example.com').status_code, 429)
+
+
+@override_settings(JOB_QUEUE_INLINE=False, JOB_RETRY_BASE_DELAY=10)
+class JobRetryTests(TestCase):
+    def test_failing_job_backs_off_then_fails(self):
+        def always_fails(**payload):
+            raise RuntimeError('boom')
+
+        delays = []
+        with (
+            mock.patch.dict(jobs.TASKS, {'always_fails': always_fails}),
+            mock.patch('api.jobs.random.uniform', return_value=1.0),
+            self.assertLogs('api.jobs', 'WARNING') as logs,
+        ):
+            queued = jobs.enqueue('always_fails', max_attempts=3, post_id=1)
+            for _ in range(3):
+                job = jobs.claim()
+                self.assertEqual(job.id, queued.id)
+                self.assertEqual(job.payload, {'post_id': 1})
+                started = timezone.now()
+                self.assertFalse(jobs.run(job))
+                job.refresh_from_db()
+                if job.status == Job.QUEUED:
+                    delays.append(round((job.run_at - started).total_seconds()))
+                    self.assertIsNone(jobs.claim())
+                    # Make the retry due now instead of waiting out the backoff
+                    Job.objects.filter(id=job.id).update(run_at=started)
+
+        self.assertEqual(delays, [10, 20])
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 3))
+        self.assertIn('RuntimeError: boom', job.last_error)
+        self.assertIsNone(jobs.claim())
+        self.assertEqual(len(logs.records), 3)
+        self.assertEqual(logs.records[-1].levelname, 'ERROR')
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False, CHANGE_LOG_MAX_ENTRIES=2)
+class ChangeFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = create_member('member')
+        [cls.post] = create_posts(cls.member, 'One')
+
+    def setUp(self):
+        self.client = member_client(self.member)
+        self.start = latest_cursor()
+        for _ in range(4):
+            record_change(Change.POST_UPDATED, self.post.id)
+
+    def changes(self, query):
+        return self.client.get(reverse('changes-list') + query)
+
+    def test_pruned_cursor_is_gone(self):
+        trim_change_log()
+        latest = latest_cursor()
+        response = self.changes(f'?since={self.start}')
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.json(), {'error': 'Cursor expired, reload the feed'})
+
+        # The oldest cursor still covered by the log keeps working
+        response = self.changes(f'?since={latest - 2}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['cursor'], str(latest))
+        self.assertEqual(response.json()['updated'][0]['id'], self.post.id)
+
+        with override_settings(ROOT_URLCONF=async_urlconf()):
+            response = self.changes(f'?since={self.start}&wait=1')
+        self.assertEqual(response.status_code, 410)
+
+    def test_cursor_ahead_of_log_is_gone(self):
+        latest = latest_cursor()
+        self.assertEqual(self.changes(f'?since={latest}').status_code, 200)
+        for async_views, urlconf in [(False, 'config.urls'), (True, async_urlconf())]:
+            with self.subTest(async_views=async_views), override_settings(ROOT_URLCONF=urlconf):
+                response = self.changes(f'?since={latest + 1}&wait=1')
+                self.assertEqual(response.status_code, 410)
+
+    def test_member_delete_records_changes(self):
+        other = create_member('other')
+        own_posts = create_posts(other, 'Mine', 'Also mine')
+        Like.objects.create(member=other, post=self.post)
+        Comment.objects.create(author=other, post=self.post, content='Hi')
+        Post.objects.filter(id=self.post.id).update(likes_count=1, comments_count=1)
+        since = latest_cursor()
+
+        other.delete()
+        response = self.changes(f'?since={since}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['updated'], [
+            {'id': self.post.id, 'likes_count': 0, 'comments_count': 0},
+        ])
+        self.assertEqual(
+            sorted(response.json()['deleted']), [post.id for post in own_posts]
+        )
+
+    @override_settings(CHANGES_MAX_WAIT=0.2, CHANGES_POLL_INTERVAL=0.05)
+    def test_long_poll_times_out_empty(self):
+        latest = latest_cursor()
+        # Only the async view holds the request; the sync one answers at once
+        for async_views, urlconf in [(False, 'config.urls'), (True, async_urlconf())]:
+            with self.subTest(async_views=async_views), override_settings(ROOT_URLCONF=urlconf):
+                started = time.monotonic()
+                response = self.changes(f'?since={latest}&wait=30')
+                elapsed = time.monotonic() - started
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), {
+                    'cursor': str(latest),
+                    'has_more': False,
+                    'created': [],
+                    'updated': [],
+                    'deleted': [],
+                })
+                if async_views:
+                    # wait is capped at CHANGES_MAX_WAIT
+                    self.assertGreaterEqual(elapsed, 0.2)
+                    self.assertLess(elapsed, 5)
+                else:
+                    self.assertLess(elapsed, 0.2)
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False)
+class AvatarUploadTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+        self.member = create_member('member')
+        self.client = member_client(self.member)
+
+    def test_uploaded_avatar_survives_profile_edit(self):
+        image = b'\x89PNG\r\n\x1a\n' + b'\x00' * 64
+        response = self.client.put(
+            reverse('profile-avatar'), image, content_type='image/png', HTTP_HOST='social.example'
+        )
+        self.assertEqual(response.status_code, 200)
+        avatar_url = response.json()['avatar_url']
+        self.assertRegex(avatar_url, r'^http://social\.example/media/avatars/[0-9a-f/]+\.png$')
+
+        # The profile form sends every field back, avatar_url included
+        profile = {
+            name: response.json()[name]
+            for name in ['first_name', 'last_name', 'bio', 'avatar_url']
+        }
+        response = self.client.patch(reverse('profile-update'), {**profile, 'bio': 'Hi'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['avatar_url'], avatar_url)
+        self.assertEqual(response.json()['bio'], 'Hi')
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False)
+class CounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_member('author')
+        cls.viewer = create_member('viewer')
+        [cls.post] = create_posts(cls.author, 'One')
+
+    def counters(self):
+        self.post.refresh_from_db()
+        return self.post.likes_count, self.post.comments_count
+
+    def test_like_and_comment_endpoints_keep_counters(self):
+        client = member_client(self.viewer)
+        client.post(reverse('posts-like', args=[self.post.id]))
+        self.assertEqual(self.counters(), (1, 0))
+        response = client.post(
+            reverse('comments-create', args=[self.post.id]), {'content': 'Hi'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.counters(), (1, 1))
+        client.delete(reverse('comments-delete', args=[response.json()['id']]))
+        client.post(reverse('posts-like', args=[self.post.id]))
+        self.assertEqual(self.counters(), (0, 0))
+
+    def test_member_delete_releases_counters(self):
+        Follow.objects.create(follower=self.viewer, followee=self.author)
+        Member.objects.filter(id=self.author.id).update(followers_count=1)
+        Like.toggle(self.viewer.id, self.post.id)
+        Like.toggle(self.author.id, self.post.id)
+        for author in [self.viewer, self.viewer, self.author]:
+            Comment.objects.create(author=author, post=self.post, content='Hi')
+        Post.adjust_counters(self.post.id, comments=3)
+
+        self.viewer.delete()
+        self.assertEqual(self.counters(), (1, 1))
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 0)
+
+    def test_member_delete_survives_drifted_counters(self):
+        Like.toggle(self.viewer.id, self.post.id)
+        Comment.objects.create(author=self.viewer, post=self.post, content='Hi')
+        Follow.objects.create(follower=self.viewer, followee=self.author)
+        # Counters that drifted below the rows they count
+        Post.objects.filter(id=self.post.id).update(likes_count=0, comments_count=0)
+
+        self.viewer.delete()
+        self.assertEqual(self.counters(), (0, 0))
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 0)
+
+
+@override_settings(
+    CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'response-cache-tests',
+    }},
+    METRICS_ENABLED=False,
+)
+class ResponseCacheTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = create_member('author')
+        self.viewer = create_member('viewer')
+        [self.post] = create_posts(self.author, 'One')
+        self.client = member_client(self.viewer)
+        self.urls = [
+            reverse('posts-list') + '?cursor=',
+            reverse('posts-detail', args=[self.post.id]),
+        ]
+
+    def likes(self, response):
+        data = response.json()
+        return (data['results'][0] if 'results' in data else data)['likes_count']
+
+    def test_cached_until_a_write_commits(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                # Served from the cache: the row is changed behind its back
+                Post.objects.filter(id=self.post.id).update(likes_count=7)
+                second = self.client.get(url)
+                self.assertEqual(second['ETag'], first['ETag'])
+                self.assertEqual(self.likes(second), 0)
+
+                with transaction.atomic():
+                    bump('posts', post_scope(self.post.id))
+                    self.assertEqual(self.client.get(url)['ETag'], first['ETag'])
+                third = self.client.get(url)
+                self.assertNotEqual(third['ETag'], first['ETag'])
+                self.assertEqual(self.likes(third), 7)
+                Post.objects.filter(id=self.post.id).update(likes_count=0)
+                bump('posts', post_scope(self.post.id))
+
+    def test_if_none_match_answers_304(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+
+                self.client.post(reverse('posts-like', args=[self.post.id]))
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], etag)
+                self.client.post(reverse('posts-like', args=[self.post.id]))
+
+    def test_viewers_get_their_own_entries(self):
+        self.client.post(reverse('posts-like', args=[self.post.id]))
+        other = member_client(self.author)
+        for url in self.urls:
+            with self.subTest(url=url):
+                for _ in range(2):
+                    mine, theirs = self.client.get(url).json(), other.get(url).json()
+                    mine, theirs = mine.get('results', [mine])[0], theirs.get('results', [theirs])[0]
+                    self.assertEqual((mine['is_liked'], theirs['is_liked']), (True, False))
+
+    def test_reconcile_invalidates_repaired_posts(self):
+        Like.objects.create(member=self.viewer, post=self.post)
+        for url in self.urls:
+            self.assertEqual(self.likes(self.client.get(url)), 0)
+
+        self.assertEqual(Post.reconcile_counters(), [self.post.id])
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.likes(self.client.get(url)), 1)
+
+
+@override_settings(
+    CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'session-tests',
+    }},
+    METRICS_ENABLED=False,
+)
+class SessionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        member_cache.clear()
+        self.member = create_member('member')
+        self.client = APIClient()
+
+    def me(self, token):
+        self.client.cookies[SESSION_COOKIE_NAME] = token
+        return self.client.get(reverse('auth-me'))
+
+    def test_tokens_round_trip_and_reject_tampering(self):
+        token = issue_session_token(self.member)
+        self.assertEqual(read_session_token(token), self.member.id)
+        self.assertEqual(self.me(token).json()['id'], self.member.id)
+
+        _, signature = token.split(':', 1)
+        for bad in [
+            f'{self.member.id + 1}:{signature}',
+            token[:-1] + ('A' if token[-1] != 'A' else 'B'),
+            signing.TimestampSigner(salt='other').sign(str(self.member.id)),
+            'garbage',
+        ]:
+            with self.subTest(token=bad):
+                with self.assertRaises(signing.BadSignature):
+                    read_session_token(bad)
+                self.assertEqual(self.me(bad).status_code, 403)
+
+    @override_settings(SESSION_TOKEN_MAX_AGE=60)
+    def test_expired_token_is_rejected(self):
+        issued_at = time.time()
+        with mock.patch('time.time', return_value=issued_at):
+            token = issue_session_token(self.member)
+        with mock.patch('time.time', return_value=issued_at + 61):
+            with self.assertRaises(signing.SignatureExpired):
+                read_session_token(token)
+            self.assertEqual(self.me(token).status_code, 403)
+
+    def test_changes_from_other_workers_reach_the_member_cache(self):
+        token = issue_session_token(self.member)
+        self.assertEqual(self.me(token).json()['first_name'], 'Member')
+        with self.assertNumQueries(0):
+            self.me(token)
+
+        # Another worker saves the member: this process's cache is left
+        # alone, only the shared version moves
+        with mock.patch.object(member_cache, 'invalidate'), self.captureOnCommitCallbacks(execute=True):
+            self.member.first_name = 'Renamed'
+            self.member.save()
+        self.assertEqual(self.me(token).json()['first_name'], 'Renamed')
+
+        with mock.patch.object(member_cache, 'invalidate'), self.captureOnCommitCallbacks(execute=True):
+            self.member.delete()
+        self.assertEqual(self.me(token).status_code, 403)
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False, JOB_QUEUE_INLINE=False)
+class PostPurgeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_member('author')
+        cls.viewer = create_member('viewer')
+
+    def add_activity(self, post):
+        Like.toggle(self.viewer.id, post.id)
+        Comment.objects.create(author=self.viewer, post=post, content='Hi')
+        deliver_to_author(post)
+
+    def activity(self, post_ids):
+        return [
+            model.objects.filter(post_id__in=post_ids).count()
+            for model in (Like, Comment, TimelineEntry)
+        ]
+
+    def run_jobs(self):
+        while (job := jobs.claim()) is not None:
+            self.assertTrue(jobs.run(job))
+
+    def test_deleted_post_is_purged_by_a_job(self):
+        post, kept = create_posts(self.author, 'Gone', 'Kept')
+        self.add_activity(post)
+        self.add_activity(kept)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = member_client(self.author).delete(reverse('posts-delete', args=[post.id]))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.activity([post.id]), [1, 1, 1])
+
+        self.run_jobs()
+        self.assertEqual(self.activity([post.id]), [0, 0, 0])
+        self.assertEqual(self.activity([kept.id]), [1, 1, 1])
+
+    def test_deleted_member_posts_are_purged_by_a_job(self):
+        posts = create_posts(self.author, 'One', 'Two')
+        for post in posts:
+            self.add_activity(post)
+
+        self.author.delete()
+        self.run_jobs()
+        self.assertEqual(self.activity([post.id for post in posts]), [0, 0, 0])
+
+
+@override_settings(
+    CACHES=DISABLED_CACHES,
+    METRICS_ENABLED=False,
+    JOB_QUEUE_INLINE=True,
+    TIMELINE_FANOUT_LIMIT=1,
+)
+class HomeTimelineTests(TestCase):
+    def setUp(self):
+        self.reader = create_member('reader')
+        self.regular = create_member('regular')
+        self.popular = create_member('popular')
+        self.other = create_member('other')
+
+    def follow(self, follower, followee):
+        response = member_client(follower).post(reverse('profile-follow', args=[followee.id]))
+        self.assertEqual(response.status_code, 200)
+
+    def publish(self, author, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = member_client(author).post(
+                reverse('posts-create'), {'content': content}, format='json'
+            )
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def feed(self, member, **params):
+        response = member_client(member).get(reverse('feed-home'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def get_link(self, link):
+        response = member_client(self.reader).get(link)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def feed_ids(self, member):
+        return [post['id'] for post in self.feed(member)['results']]
+
+    def test_posts_fan_out_to_followers(self):
+        self.follow(self.reader, self.regular)
+        post_id = self.publish(self.regular, 'Pushed')
+
+        self.assertTrue(TimelineEntry.objects.filter(owner=self.reader, post_id=post_id).exists())
+        self.assertEqual(self.feed_ids(self.reader), [post_id])
+        self.assertEqual(self.feed_ids(self.other), [])
+
+    def test_high_follower_posts_are_merged_on_read(self):
+        self.follow(self.reader, self.regular)
+        self.follow(self.reader, self.popular)
+        self.follow(self.other, self.popular)
+        posted = [
+            self.publish(self.regular, 'One'),
+            self.publish(self.popular, 'Two'),
+            self.publish(self.regular, 'Three'),
+            self.publish(self.popular, 'Four'),
+        ]
+
+        self.assertFalse(TimelineEntry.objects.filter(owner=self.reader, author=self.popular).exists())
+        self.assertEqual(self.feed_ids(self.reader), posted[::-1])
+
+    def test_post_in_both_sources_is_listed_once(self):
+        self.follow(self.reader, self.popular)
+        post_id = self.publish(self.popular, 'Pushed then pulled')
+        self.follow(self.other, self.popular)
+
+        self.assertTrue(TimelineEntry.objects.filter(owner=self.reader, post_id=post_id).exists())
+        self.assertEqual(self.feed_ids(self.reader), [post_id])
+
+    def test_unfollow_purges_timeline(self):
+        self.follow(self.reader, self.regular)
+        self.publish(self.regular, 'Soon gone')
+
+        response = member_client(self.reader).delete(reverse('profile-follow', args=[self.regular.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(TimelineEntry.objects.filter(owner=self.reader).exists())
+        self.assertEqual(self.feed_ids(self.reader), [])
+
+    def test_post_delete_purges_timeline(self):
+        self.follow(self.reader, self.regular)
+        post_id = self.publish(self.regular, 'Soon gone')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = member_client(self.regular).delete(reverse('posts-delete', args=[post_id]))
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(TimelineEntry.objects.filter(post_id=post_id).exists())
+        self.assertEqual(self.feed_ids(self.reader), [])
+
+    def test_pages_walk_across_equal_timestamps(self):
+        self.follow(self.reader, self.regular)
+        self.follow(self.reader, self.popular)
+        self.follow(self.other, self.popular)
+        for index in range(3):
+            self.publish(self.regular, f'Regular {index}')
+            self.publish(self.popular, f'Popular {index}')
+        moment = timezone.now()
+        Post.objects.update(created_at=moment)
+        TimelineEntry.objects.update(created_at=moment)
+        expected = list(Post.objects.order_by('-id').values_list('id', flat=True))
+
+        pages = [self.feed(self.reader, page_size=2)]
+        while pages[-1]['next']:
+            pages.append(self.get_link(pages[-1]['next']))
+        self.assertEqual(
+            [post['id'] for page in pages for post in page['results']],
+            expected,
+        )
+        self.assertIsNone(pages[0]['previous'])
+
+        backwards = [pages[-1]]
+        while backwards[-1]['previous']:
+            backwards.append(self.get_link(backwards[-1]['previous']))
+        self.assertEqual(
+            [page['results'] for page in backwards[1:]],
+            [page['results'] for page in pages[-2::-1]],
+        )
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False)
+class CursorPaginationTests(TestCase):
+    """Keyset pages of /api/posts/ with `cursor`"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = create_member('member')
+        create_posts(cls.member, *[f'Post {index}' for index in range(7)])
+        # Every post shares one timestamp so only the id breaks ties.
+        Post.objects.update(created_at=timezone.now())
+        cls.expected = list(Post.objects.order_by('-id').values_list('id', flat=True))
+
+    def setUp(self):
+        self.client = member_client(self.member)
+
+    def get_page(self, link):
+        response = self.client.get(link)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def result_ids(self, page):
+        return [post['id'] for post in page['results']]
+
+    def test_next_and_previous_round_trip(self):
+        pages = [self.get_page(reverse('posts-list') + '?cursor=&page_size=3')]
+        while pages[-1]['next']:
+            pages.append(self.get_page(pages[-1]['next']))
+        self.assertEqual([len(page['results']) for page in pages], [3, 3, 1])
+        self.assertEqual([post_id for page in pages for post_id in self.result_ids(page)], self.expected)
+        self.assertIsNone(pages[0]['previous'])
+
+        backwards = [pages[-1]]
+        while backwards[-1]['previous']:
+            backwards.append(self.get_page(backwards[-1]['previous']))
+        self.assertEqual(
+            [self.result_ids(page) for page in backwards],
+            [self.result_ids(page) for page in pages[::-1]],
+        )
+        self.assertIsNotNone(backwards[-1]['next'])
+
+    def test_links_keep_other_parameters(self):
+        page = self.get_page(reverse('posts-list') + '?cursor=&page_size=3&fields=id')
+        self.assertIn('fields=id', page['next'])
+        self.assertIn('page_size=3', page['next'])
+        self.assertEqual(list(self.get_page(page['next'])['results'][0]), ['id'])
+
+    def test_count_is_opt_in(self):
+        Post.objects.filter(id=self.expected[3]).delete()
+        url = reverse('posts-list') + '?cursor=&page_size=2'
+        self.assertIsNone(self.get_page(url)['count'])
+        self.assertIsNone(self.get_page(url + '&count=bogus')['count'])
+        self.assertEqual(self.get_page(url + '&count=exact')['count'], 6)
+        # The primary key range still spans the deleted post.
+        self.assertEqual(self.get_page(url + '&count=approx')['count'], 7)
+
+    def test_count_of_empty_list_is_zero(self):
+        Post.objects.all().delete()
+        for mode in 'exact', 'approx':
+            with self.subTest(count=mode):
+                page = self.get_page(reverse('posts-list') + '?cursor=&count=' + mode)
+                self.assertEqual(page['count'], 0)
+                self.assertEqual(page['results'], [])
+
+    def test_invalid_cursor_is_rejected(self):
+        timestamp = timezone.now().isoformat()
+        for cursor in [
+            'not a cursor',
+            '%%%',
+            encode_cursor([timestamp, 1]),
+            encode_cursor({'t': timestamp}),
+            encode_cursor({'t': timestamp, 'i': '1'}),
+            encode_cursor({'t': 'yesterday', 'i': 1}),
+            encode_cursor({'t': timestamp, 'i': 1})[:-3],
+        ]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse('posts-list'), {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'error': 'Invalid cursor'})
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False, PROFILE_POSTS_PAGE_SIZE=2)
+class ProfilePostsTests(TestCase):
+    """The profile carries the first page of posts; profile/<id>/posts/ the rest"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_member('author')
+        cls.quiet = create_member('quiet')
+        cls.viewer = create_member('viewer')
+        create_posts(cls.author, *[f'Post {index}' for index in range(5)])
+        create_posts(cls.quiet, 'Only post')
+        create_posts(cls.viewer, 'Not theirs')
+        cls.expected = list(cls.author.posts.order_by('-created_at', '-id').values_list('id', flat=True))
+
+    def setUp(self):
+        self.client = member_client(self.viewer)
+
+    def get_json(self, link):
+        response = self.client.get(link)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_profile_links_to_the_remaining_posts(self):
+        profile = self.get_json(reverse('profile-detail', args=[self.author.id]))
+        posted = [post['id'] for post in profile['posts']]
+        self.assertEqual(len(posted), 2)
+
+        link = profile['posts_next']
+        while link:
+            page = self.get_json(link)
+            posted.extend(post['id'] for post in page['results'])
+            link = page['next']
+        self.assertEqual(posted, self.expected)
+
+    def test_posts_endpoint_uses_the_profile_page_size(self):
+        page = self.get_json(reverse('profile-posts', args=[self.author.id]))
+        self.assertEqual([post['id'] for post in page['results']], self.expected[:2])
+        self.assertIsNone(page['previous'])
+
+        page = self.get_json(reverse('profile-posts', args=[self.author.id]) + '?page_size=10')
+        self.assertEqual([post['id'] for post in page['results']], self.expected)
+        self.assertIsNone(page['next'])
+
+    def test_last_page_has_no_next_link(self):
+        profile = self.get_json(reverse('profile-detail', args=[self.quiet.id]))
+        self.assertEqual(len(profile['posts']), 1)
+        self.assertIsNone(profile['posts_next'])
+
+    def test_profile_queries_do_not_grow_with_posts(self):
+        counts = []
+        for member in self.quiet, self.author:
+            with CaptureQueriesContext(connection) as queries:
+                self.get_json(reverse('profile-detail', args=[member.id]))
+            counts.append(len(queries))
+        self.assertEqual(counts[1], counts[0])
+
+    def test_unknown_member_is_not_found(self):
+        response = self.client.get(reverse('profile-posts', args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(CACHES=DISABLED_CACHES, METRICS_ENABLED=False, MAX_PAGE_SIZE=1000)
+class StreamingTests(TestCase):
+    """`stream=1` must send the bytes of the buffered response"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_member('author', bio='Line one\nline two')
+        cls.viewer = create_member('viewer')
+        cls.post = create_posts(cls.author, 'Commented')[0]
+        Like.toggle(cls.viewer.id, cls.post.id)
+        # More comments than one streamed chunk holds
+        Comment.objects.bulk_create([
+            Comment(author=(cls.author, cls.viewer)[index % 2], post=cls.post, content=f'Comment {index} ✓')
+            for index in range(STREAM_CHUNK_SIZE + 10)
+        ])
+        create_posts(cls.author, *[f'Post {index} "quoted"' for index in range(5)])
+
+    def setUp(self):
+        self.client = member_client(self.viewer)
+
+    def assertStreamMatches(self, link):
+        """Walk every page from link, comparing both modes; returns the page count"""
+        pages = 0
+        while link:
+            buffered = self.client.get(link)
+            streamed = self.client.get(link + '&stream=1')
+            self.assertEqual(buffered.status_code, 200)
+            self.assertEqual(streamed.status_code, 200)
+            self.assertTrue(streamed.streaming)
+            body = b''.join(streamed.streaming_content)
+            # Links in the streamed page carry stream=1 along
+            self.assertEqual(body.replace(b'&stream=1', b''), buffered.content)
+            link = buffered.json()['next']
+            pages += 1
+        return pages
+
+    def test_comments_match(self):
+        url = reverse('comments-list', args=[self.post.id])
+        for query in [
+            f'?page_size={STREAM_CHUNK_SIZE + 5}',
+            '?page_size=90',
+            '?page_size=90&sideload=members',
+            '?page_size=90&fields=id,content,author.username',
+        ]:
+            with self.subTest(query=query):
+                self.assertGreater(self.assertStreamMatches(url + query), 1)
+
+    def test_profile_posts_match(self):
+        url = reverse('profile-posts', args=[self.author.id])
+        for query in [
+            '?page_size=2',
+            '?page_size=2&sideload=members',
+            '?page_size=2&fields=id,is_liked,likes_count',
+        ]:
+            with self.subTest(query=query):
+                self.assertEqual(self.assertStreamMatches(url + query), 3)
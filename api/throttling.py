@@ -0,0 +1,59 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket kept in the shared cache, so every gunicorn worker draws
+    from the same bucket.
+
+    A rate of 'N/period' allows bursts of N requests and refills at N per
+    period. Buckets are read and written without a lock, so concurrent
+    requests from one client may occasionally get one extra token; that is
+    acceptable for abuse protection and keeps the check to two cache calls.
+    """
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        refill_per_second = self.num_requests / self.duration
+        tokens, updated_at = self.cache.get(self.key, (self.num_requests, now))
+        tokens = min(self.num_requests, tokens + (now - updated_at) * refill_per_second)
+        if tokens < 1:
+            self.wait_seconds = (1 - tokens) / refill_per_second
+            return False
+
+        self.cache.set(self.key, (tokens - 1, now), self.duration)
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class ClientIPThrottle(TokenBucketThrottle):
+    """Bucket per client address, for the rate set under this scope"""
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginIPThrottle(ClientIPThrottle):
+    scope = 'login_ip'
+
+
+class RegisterIPThrottle(ClientIPThrottle):
+    scope = 'register_ip'
+
+
+class LoginEmailThrottle(TokenBucketThrottle):
+    """Bucket per submitted email, so one account cannot be guessed at from many addresses"""
+    scope = 'login_email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': email.strip().lower()}
@@ -0,0 +1,139 @@
+from django.conf import settings
+
+from api.models import Member, Post, Follow, TimelineEntry
+from api.pagination import KeysetPaginator, MergedKeysetPaginator
+
+FANOUT_BATCH_SIZE = 1000
+
+
+def is_fanout_author(author):
+    """Whether posts by author are pushed to follower timelines on write"""
+    return author.followers_count <= settings.TIMELINE_FANOUT_LIMIT
+
+
+def fan_out_post(post):
+    """
+    Deliver a new post to its author's timeline and, for regular authors, to
+    every follower's timeline. Posts by high-follower authors are merged in at
+    read time instead.
+    """
+    deliver_to_author(post)
+    deliver_to_followers(post)
+
+
+def deliver_to_author(post):
+    """Put a new post in its author's own timeline"""
+    TimelineEntry.objects.bulk_create(
+        [TimelineEntry(
+            owner_id=post.author_id,
+            post_id=post.id,
+            author_id=post.author_id,
+            created_at=post.created_at,
+        )],
+        ignore_conflicts=True,
+    )
+
+
+def deliver_to_followers(post):
+    """
+    Put a post in the timeline of every follower of a regular author. Safe to
+    repeat: entries that already exist are skipped.
+    """
+    if not is_fanout_author(post.author):
+        return
+
+    follower_ids = (
+        Follow.objects.filter(followee_id=post.author_id)
+        .order_by()
+        .values_list('follower_id', flat=True)
+    )
+    entries = []
+    for follower_id in follower_ids.iterator(chunk_size=FANOUT_BATCH_SIZE):
+        entries.append(TimelineEntry(
+            owner_id=follower_id,
+            post_id=post.id,
+            author_id=post.author_id,
+            created_at=post.created_at,
+        ))
+        if len(entries) >= FANOUT_BATCH_SIZE:
+            TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+            entries = []
+    TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+
+
+def backfill_timeline(owner, followee):
+    """Copy the followee's most recent posts into a new follower's timeline"""
+    if not is_fanout_author(followee):
+        return
+    posts = (
+        Post.objects.filter(author=followee)
+        .values_list('id', 'created_at')[:settings.TIMELINE_BACKFILL_SIZE]
+    )
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(
+                owner_id=owner.id,
+                post_id=post_id,
+                author_id=followee.id,
+                created_at=created_at,
+            )
+            for post_id, created_at in posts
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def purge_timeline(owner, author):
+    """Remove an unfollowed author's posts from owner's timeline"""
+    TimelineEntry.objects.filter(owner=owner, author=author).delete()
+
+
+def purge_post_timeline(post_id):
+    """
+    Remove a deleted post from every timeline, one batch per statement so
+    the write lock is never held for a whole fan-out
+    """
+    while True:
+        entry_ids = list(
+            TimelineEntry.objects.filter(post_id=post_id)
+            .values_list('id', flat=True)[:FANOUT_BATCH_SIZE]
+        )
+        if not entry_ids:
+            return
+        TimelineEntry.objects.filter(id__in=entry_ids).delete()
+
+
+def home_timeline_page(member, page_size, cursor=None):
+    """
+    Return a KeysetPage of posts for member's home feed.
+
+    The materialized timeline is read with one range scan; posts of followed
+    high-follower authors are read on demand and merged by (created_at, id).
+    """
+    sources = [KeysetPaginator(
+        TimelineEntry.objects.filter(owner=member).only('post_id', 'created_at'),
+        page_size,
+        id_field='post_id',
+    )]
+
+    pulled_author_ids = list(
+        Member.objects.filter(
+            followers__follower=member,
+            followers_count__gt=settings.TIMELINE_FANOUT_LIMIT,
+        ).order_by().values_list('id', flat=True)
+    )
+    if pulled_author_ids:
+        sources.append(KeysetPaginator(
+            Post.objects.filter(author_id__in=pulled_author_ids).only('id', 'created_at'),
+            page_size,
+        ))
+
+    page = MergedKeysetPaginator(sources, page_size).page(cursor)
+
+    post_ids = [
+        item.post_id if isinstance(item, TimelineEntry) else item.id
+        for item in page.object_list
+    ]
+    posts = Post.objects.select_related('author').order_by().in_bulk(post_ids)
+    page.object_list = [posts[post_id] for post_id in post_ids if post_id in posts]
+    return page
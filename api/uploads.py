@@ -0,0 +1,82 @@
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+
+# Leading bytes of each accepted image format, and the extension stored
+# files get; nginx derives the served Content-Type from the extension
+IMAGE_SIGNATURES = [
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+]
+
+
+class InvalidUpload(ValueError):
+    pass
+
+
+class UploadTooLarge(InvalidUpload):
+    pass
+
+
+def image_extension(head):
+    """Return the file extension for an image's first bytes, or None"""
+    for signature, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+def store_image(stream, directory, max_bytes):
+    """
+    Copy an image from stream into MEDIA_ROOT/directory and return its path
+    relative to MEDIA_ROOT.
+
+    The body is read in UPLOAD_CHUNK_SIZE chunks and hashed while it is
+    written to a temporary file, so memory use does not depend on the size
+    of the upload. The file is named after its SHA-256, which deduplicates
+    identical uploads and lets it be served as immutable: the content at a
+    path never changes.
+    """
+    target_dir = os.path.join(settings.MEDIA_ROOT, directory)
+    os.makedirs(target_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    extension = None
+    # Created next to the final path, so the rename below is atomic
+    handle = tempfile.NamedTemporaryFile(dir=target_dir, prefix='.upload-', delete=False)
+    try:
+        with handle:
+            while chunk := stream.read(settings.UPLOAD_CHUNK_SIZE):
+                if extension is None:
+                    extension = image_extension(chunk)
+                    if extension is None:
+                        raise InvalidUpload('Unsupported image format')
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f'Images may be at most {max_bytes} bytes')
+                digest.update(chunk)
+                handle.write(chunk)
+        if extension is None:
+            raise InvalidUpload('Empty upload')
+
+        name = digest.hexdigest()
+        relative_path = os.path.join(directory, name[:2], f'{name}.{extension}')
+        final_path = os.path.join(settings.MEDIA_ROOT, relative_path)
+        if os.path.exists(final_path):
+            os.unlink(handle.name)
+        else:
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            # nginx workers run as a different user and must be able to read it
+            os.chmod(handle.name, 0o644)
+            os.replace(handle.name, final_path)
+        return relative_path
+    except BaseException:
+        if os.path.exists(handle.name):
+            os.unlink(handle.name)
+        raise
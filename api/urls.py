@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from api.views import (
     RegisterView,
@@ -5,17 +6,36 @@ from api.views import (
     LogoutView,
     MeView,
     PostListView,
+    HomeFeedView,
+    PostSearchView,
     PostCreateView,
     PostDetailView,
     PostDeleteView,
     PostLikeView,
+    PostLikeStateView,
+    ChangeListView,
     CommentListView,
     CommentCreateView,
     CommentDeleteView,
     ProfileDetailView,
-    ProfileUpdateView
+    ProfilePostsView,
+    ProfileUpdateView,
+    AvatarUploadView,
+    FollowView,
+    BatchView
 )
 
+if settings.ASYNC_READ_VIEWS:
+    # Served over ASGI: read-heavy views run on the async ORM
+    from api.async_views import (
+        AsyncMeView as MeView,
+        AsyncPostListView as PostListView,
+        AsyncPostDetailView as PostDetailView,
+        AsyncCommentListView as CommentListView,
+        AsyncChangeListView as ChangeListView,
+        AsyncProfileDetailView as ProfileDetailView,
+    )
+
 urlpatterns = [
     # Authentication endpoints
     path('auth/register/', RegisterView.as_view(), name='auth-register'),
@@ -25,10 +45,14 @@ urlpatterns = [
     
     # Posts endpoints
     path('posts/', PostListView.as_view(), name='posts-list'),
+    path('feed/', HomeFeedView.as_view(), name='feed-home'),
+    path('posts/search/', PostSearchView.as_view(), name='posts-search'),
     path('posts/create/', PostCreateView.as_view(), name='posts-create'),
     path('posts/<int:id>/', PostDetailView.as_view(), name='posts-detail'),
     path('posts/<int:id>/delete/', PostDeleteView.as_view(), name='posts-delete'),
     path('posts/<int:id>/like/', PostLikeView.as_view(), name='posts-like'),
+    path('posts/likes/state/', PostLikeStateView.as_view(), name='posts-like-state'),
+    path('changes/', ChangeListView.as_view(), name='changes-list'),
     
     # Comments endpoints
     path('posts/<int:post_id>/comments/', CommentListView.as_view(), name='comments-list'),
@@ -37,5 +61,11 @@ urlpatterns = [
     
     # Profile endpoints
     path('profile/<int:id>/', ProfileDetailView.as_view(), name='profile-detail'),
+    path('profile/<int:id>/posts/', ProfilePostsView.as_view(), name='profile-posts'),
     path('profile/', ProfileUpdateView.as_view(), name='profile-update'),
+    path('profile/avatar/', AvatarUploadView.as_view(), name='profile-avatar'),
+    path('profile/<int:id>/follow/', FollowView.as_view(), name='profile-follow'),
+    
+    # Batch endpoint
+    path('batch/', BatchView.as_view(), name='batch'),
 ]
@@ -1,12 +1,46 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.authentication import BaseAuthentication
-from rest_framework.exceptions import AuthenticationFailed
+from django.conf import settings
 from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import F
 from django.shortcuts import get_object_or_404
 
-from api.models import Member, Post, Like, Comment
+from api.authentication import (
+    CookieAuthentication,
+    SESSION_COOKIE_NAME,
+    issue_session_token,
+)
+from api.batch import InvalidSubrequest, run_subrequest, validate_subrequest
+from api.caching import bump, cached_response, post_scope
+from api.changes import (
+    ExpiredCursor,
+    latest_cursor,
+    read_changes,
+    record_change,
+    summarize_changes,
+)
+from api.hashing import run_hashing
+from api.jobs import enqueue
+from api.loaders import load_liked_post_ids
+from api.models import Member, Post, Like, Comment, Follow, Change
+from api.pagination import (
+    InvalidCursor,
+    KeysetPaginator,
+    approximate_count,
+    cursor_link,
+)
+from api.search import search_posts
+from api.streaming import StreamingListResponse
+from api.throttling import LoginEmailThrottle, LoginIPThrottle, RegisterIPThrottle
+from api.uploads import InvalidUpload, UploadTooLarge, store_image
+from api.timeline import (
+    backfill_timeline,
+    deliver_to_author,
+    home_timeline_page,
+    purge_timeline,
+)
 from api.serializers import (
     MemberSerializer,
     MemberRegistrationSerializer,
@@ -16,26 +50,99 @@ from api.serializers import (
     PostCreateSerializer,
     CommentSerializer,
     CommentCreateSerializer,
-    ProfileSerializer
+    ProfileSerializer,
+    FAST_LIST_SERIALIZERS,
+    InvalidFields,
+    is_selected,
+    parse_field_selection,
 )
 
 
-class CookieAuthentication(BaseAuthentication):
+def is_streaming(request):
+    """Whether the client asked for a streamed list response"""
+    return request.GET.get('stream') == '1'
+
+
+def get_page_size(request, default, streaming=True):
     """
-    Custom authentication class that authenticates users via HttpOnly cookie.
-    Cookie name: 'session_id', value: member_id
+    Parse page_size, raising ValueError unless it is a positive integer.
+    Streamed responses may use larger pages; pass streaming=False for views
+    that never stream.
     """
-    def authenticate(self, request):
-        session_id = request.COOKIES.get('session_id')
-        
-        if not session_id:
-            return None
-        
-        try:
-            member = Member.objects.get(id=session_id)
-            return (member, None)
-        except (Member.DoesNotExist, ValueError):
-            raise AuthenticationFailed('Invalid session')
+    if streaming and is_streaming(request):
+        maximum = settings.STREAMING_MAX_PAGE_SIZE
+    else:
+        maximum = settings.MAX_PAGE_SIZE
+    page_size = int(request.GET.get('page_size', default))
+    if page_size < 1:
+        raise ValueError('page_size must be positive')
+    return min(page_size, maximum)
+
+
+def is_sideloading(request):
+    """Whether the client asked for authors as one `members` map (`sideload=members`)"""
+    return 'members' in request.GET.get('sideload', '').split(',')
+
+
+def serializer_context(request, **extra):
+    """
+    Serializer context for request. With `sideload=members` it carries the
+    `members` dict that post and comment serializers collect authors into.
+    """
+    context = {'request': request, **extra}
+    if is_sideloading(request):
+        context['members'] = {}
+    return context
+
+
+def with_members(data, context):
+    """Add the members collected while serializing to a response body"""
+    if 'members' in context:
+        data['members'] = context['members']
+    return data
+
+
+def field_selection(request, serializer_class):
+    """
+    Parse `fields` and `expand` into a selection of serializer_class fields,
+    or None to render every field. Raises InvalidFields for unknown fields.
+    """
+    selection = parse_field_selection(
+        request.GET.get('fields', ''),
+        request.GET.get('expand', '')
+    )
+    serializer_class.validate_selection(selection)
+    return selection
+
+
+def list_source(queryset, serializer_class, fields=None):
+    """
+    Return the queryset and serializer class a list endpoint should use:
+    values() rows and the matching row serializer when
+    FAST_LIST_SERIALIZATION is on, the model serializer otherwise. Either
+    way only the columns and joins the `fields` selection needs are read.
+    """
+    fast_class = FAST_LIST_SERIALIZERS.get(serializer_class)
+    if not settings.FAST_LIST_SERIALIZATION or fast_class is None:
+        return serializer_class.select_columns(queryset, fields), serializer_class
+    return fast_class.rows(queryset, fields), fast_class
+
+
+def list_response(request, envelope, items, serializer_class, fields=None):
+    """
+    Build a list envelope with `results` appended, and `members` after them
+    when sideloading, streamed row by row when `stream=1` is passed and fully
+    buffered otherwise. `fields` selects the fields of each item.
+    """
+    context = serializer_context(request, fields=fields)
+    if is_streaming(request):
+        trailer = (lambda: with_members({}, context)) if 'members' in context else None
+        return StreamingListResponse(envelope, items, serializer_class, context, trailer=trailer)
+    serializer = serializer_class(items, many=True, context=context)
+    return Response(
+        with_members({**envelope, 'results': serializer.data}, context),
+        status=status.HTTP_200_OK
+    )
 
 
 class RegisterView(APIView):
@@ -44,6 +151,7 @@ class RegisterView(APIView):
     """
     authentication_classes = []
     permission_classes = []
+    throttle_classes = [RegisterIPThrottle]
 
     def post(self, request):
         serializer = MemberRegistrationSerializer(data=request.data)
@@ -62,6 +170,7 @@ class LoginView(APIView):
     """
     authentication_classes = []
     permission_classes = []
+    throttle_classes = [LoginIPThrottle, LoginEmailThrottle]
 
     def post(self, request):
         serializer = MemberLoginSerializer(data=request.data)
@@ -79,7 +188,7 @@ class LoginView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
-        if not member.check_password(password):
+        if not run_hashing(member.check_password, password):
             return Response(
                 {'error': 'Invalid credentials'},
                 status=status.HTTP_401_UNAUTHORIZED
@@ -90,8 +199,9 @@ class LoginView(APIView):
             status=status.HTTP_200_OK
         )
         response.set_cookie(
-            key='session_id',
-            value=str(member.id),
+            key=SESSION_COOKIE_NAME,
+            value=issue_session_token(member),
+            max_age=settings.SESSION_TOKEN_MAX_AGE,
             httponly=True,
             samesite='Lax',
             path='/'
@@ -116,7 +226,7 @@ class LogoutView(APIView):
             {'message': 'Successfully logged out'},
             status=status.HTTP_200_OK
         )
-        response.delete_cookie('session_id', path='/')
+        response.delete_cookie(SESSION_COOKIE_NAME, path='/')
         return response
 
 
@@ -140,6 +250,11 @@ class MeView(APIView):
 class PostListView(APIView):
     """
     GET /api/posts/ - Get paginated list of posts
+
+    Pass `cursor` (empty for the first page) to use keyset pagination;
+    `count=exact|approx` then opts into a total. Without `cursor` the legacy
+    `page` mode is used. `stream=1` streams the response. Buffered
+    responses are cached and carry an ETag for conditional requests.
     """
     authentication_classes = [CookieAuthentication]
 
@@ -150,27 +265,166 @@ class PostListView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
-        page = request.GET.get('page', 1)
-        page_size = min(int(request.GET.get('page_size', 20)), 100)
+        return cached_response(request, ['posts'], lambda: self.get_page(request))
+
+    def get_page(self, request):
+        try:
+            fields = field_selection(request, PostSerializer)
+        except InvalidFields as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            page_size = get_page_size(request, 20)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid page_size'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        posts, serializer_class = list_source(
+            Post.objects.all().select_related('author'),
+            PostSerializer,
+            fields
+        )
         
-        posts = Post.objects.all().select_related('author').prefetch_related('likes', 'comments')
+        if 'cursor' in request.GET:
+            return self.get_cursor_page(request, posts, page_size, serializer_class, fields)
+        
+        page = request.GET.get('page', 1)
         paginator = Paginator(posts, page_size)
         page_obj = paginator.get_page(page)
         
+        return list_response(request, {
+            'count': paginator.count,
+            'next': f'/api/posts/?page={page_obj.next_page_number()}' if page_obj.has_next() else None,
+            'previous': f'/api/posts/?page={page_obj.previous_page_number()}' if page_obj.has_previous() else None,
+        }, page_obj.object_list, serializer_class, fields)
+
+    def get_cursor_page(self, request, posts, page_size, serializer_class, fields):
+        try:
+            page = KeysetPaginator(posts, page_size).page(
+                request.GET.get('cursor') or None,
+                lazy=is_streaming(request)
+            )
+        except InvalidCursor:
+            return Response(
+                {'error': 'Invalid cursor'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        count_mode = request.GET.get('count')
+        if count_mode == 'exact':
+            count = posts.count()
+        elif count_mode == 'approx':
+            count = approximate_count(posts)
+        else:
+            count = None
+        
+        return list_response(request, {
+            'count': count,
+            'next': cursor_link(request, page.next_cursor),
+            'previous': cursor_link(request, page.previous_cursor),
+        }, page.object_list, serializer_class, fields)
+
+
+class HomeFeedView(APIView):
+    """
+    GET /api/feed/ - Get cursor-paginated home timeline of followed members
+    """
+    authentication_classes = [CookieAuthentication]
+
+    def get(self, request):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        try:
+            page_size = get_page_size(request, 20, streaming=False)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid page_size'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            page = home_timeline_page(
+                request.user,
+                page_size,
+                request.GET.get('cursor') or None
+            )
+        except InvalidCursor:
+            return Response(
+                {'error': 'Invalid cursor'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         serializer = PostSerializer(
-            page_obj.object_list,
+            page.object_list,
             many=True,
             context={'request': request}
         )
         
         return Response({
-            'count': paginator.count,
-            'next': f'/api/posts/?page={page_obj.next_page_number()}' if page_obj.has_next() else None,
-            'previous': f'/api/posts/?page={page_obj.previous_page_number()}' if page_obj.has_previous() else None,
+            'next': cursor_link(request, page.next_cursor),
+            'previous': cursor_link(request, page.previous_cursor),
             'results': serializer.data
         }, status=status.HTTP_200_OK)
 
 
+class PostSearchView(APIView):
+    """
+    GET /api/posts/search/?q= - Full-text search over posts, best match first
+    """
+    authentication_classes = [CookieAuthentication]
+
+    def get(self, request):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        query = request.GET.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'Query is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            page_size = get_page_size(request, 20, streaming=False)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid page_size'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            posts, snippets, next_cursor = search_posts(
+                query,
+                page_size,
+                request.GET.get('cursor') or None
+            )
+        except InvalidCursor:
+            return Response(
+                {'error': 'Invalid cursor'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        results = PostSerializer(posts, many=True, context={'request': request}).data
+        for item in results:
+            item['snippet'] = snippets[item['id']]
+        
+        return Response({
+            'next': cursor_link(request, next_cursor),
+            'results': results
+        }, status=status.HTTP_200_OK)
+
+
 class PostCreateView(APIView):
     """
     POST /api/posts/create/ - Create a new post
@@ -186,7 +440,12 @@ class PostCreateView(APIView):
         
         serializer = PostCreateSerializer(data=request.data)
         if serializer.is_valid():
-            post = serializer.save(author=request.user)
+            with transaction.atomic():
+                post = serializer.save(author=request.user)
+                deliver_to_author(post)
+                enqueue('fan_out_post', post_id=post.id)
+                record_change(Change.POST_CREATED, post.id)
+            bump('posts')
             return Response(
                 PostSerializer(post, context={'request': request}).data,
                 status=status.HTTP_201_CREATED
@@ -197,6 +456,8 @@ class PostCreateView(APIView):
 class PostDetailView(APIView):
     """
     GET /api/posts/{id}/ - Get a single post
+
+    Cached, and answers If-None-Match with 304 when the post is unchanged.
     """
     authentication_classes = [CookieAuthentication]
 
@@ -207,8 +468,23 @@ class PostDetailView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
-        post = get_object_or_404(Post, id=id)
-        serializer = PostSerializer(post, context={'request': request})
+        return cached_response(
+            request,
+            [post_scope(id), 'members'],
+            lambda: self.get_post(request, id)
+        )
+
+    def get_post(self, request, id):
+        try:
+            fields = field_selection(request, PostSerializer)
+        except InvalidFields as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        post = get_object_or_404(PostSerializer.select_columns(Post.objects.all(), fields), id=id)
+        serializer = PostSerializer(post, context={'request': request, 'fields': fields})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -233,7 +509,11 @@ class PostDeleteView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        post.delete()
+        with transaction.atomic():
+            post.delete()
+            enqueue('purge_deleted_post', post_id=id)
+            record_change(Change.POST_DELETED, id)
+        bump('posts', post_scope(id))
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -250,28 +530,160 @@ class PostLikeView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
-        post = get_object_or_404(Post, id=id)
+        with transaction.atomic():
+            result = Like.toggle(request.user.id, id)
+            if result is not None:
+                record_change(Change.POST_UPDATED, id)
+        if result is None:
+            return Response(
+                {'error': 'Post not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        is_liked, likes_count = result
+        bump('posts', post_scope(id))
+        return Response({
+            'is_liked': is_liked,
+            'likes_count': likes_count
+        }, status=status.HTTP_200_OK)
+
+
+class PostLikeStateView(APIView):
+    """
+    GET /api/posts/likes/state/?ids=1,2,3 - Like state and counts of many posts
+
+    Unknown post IDs are left out of the results.
+    """
+    authentication_classes = [CookieAuthentication]
+
+    def get(self, request):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        try:
+            ids = [int(value) for value in request.GET.get('ids', '').split(',') if value]
+        except ValueError:
+            return Response(
+                {'error': 'Invalid ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(ids) > settings.MAX_PAGE_SIZE:
+            return Response(
+                {'error': f'At most {settings.MAX_PAGE_SIZE} ids are allowed'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        counts = dict(
+            Post.objects.filter(id__in=ids).order_by().values_list('id', 'likes_count')
+        )
+        liked_ids = load_liked_post_ids(request.user, list(counts)) if counts else set()
+        return Response({
+            'results': [
+                {
+                    'id': post_id,
+                    'is_liked': post_id in liked_ids,
+                    'likes_count': counts[post_id],
+                }
+                for post_id in dict.fromkeys(ids) if post_id in counts
+            ]
+        }, status=status.HTTP_200_OK)
+
+
+class ChangeListView(APIView):
+    """
+    GET /api/changes/?since={cursor}&wait={seconds} - Post feed changes since a cursor
+
+    Without since, only the current cursor is returned. wait is validated
+    but not honoured here: a sync long poll would hold one of the few WSGI
+    request threads for its whole wait, so only AsyncChangeListView holds
+    requests until a change arrives.
+    """
+    authentication_classes = [CookieAuthentication]
+
+    def get(self, request):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
         
-        like, created = Like.objects.get_or_create(
-            member=request.user,
-            post=post
+        try:
+            since, _ = self.get_params(request)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid since or wait'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if since is None:
+            return self.changes_response(request, latest_cursor(), [])
+        
+        try:
+            rows = self.read(since)
+        except ExpiredCursor:
+            return self.expired_response()
+        return self.changes_response(request, since, rows)
+
+    def get_params(self, request):
+        """Parse since (None when absent) and wait, capped at CHANGES_MAX_WAIT"""
+        since = request.GET.get('since', '')
+        since = int(since) if since else None
+        wait = float(request.GET.get('wait', 0))
+        if (since is not None and since < 0) or not 0 <= wait < float('inf'):
+            raise ValueError()
+        return since, min(wait, settings.CHANGES_MAX_WAIT)
+
+    def read(self, since):
+        # One extra row tells whether there is more to fetch
+        return read_changes(since, settings.CHANGES_PAGE_SIZE + 1)
+
+    def expired_response(self):
+        return Response(
+            {'error': 'Cursor expired, reload the feed'},
+            status=status.HTTP_410_GONE
         )
+
+    def changes_response(self, request, since, rows):
+        """
+        Collapse change rows into new posts (fully serialized), fresh
+        counters of changed posts and ids of deleted posts
+        """
+        has_more = len(rows) > settings.CHANGES_PAGE_SIZE
+        rows = rows[:settings.CHANGES_PAGE_SIZE]
+        created_ids, updated_ids, deleted_ids = summarize_changes(rows)
         
-        if not created:
-            like.delete()
-            is_liked = False
-        else:
-            is_liked = True
+        created = []
+        if created_ids:
+            # Post ids grow with created_at, and ordering by the primary key
+            # lets SQLite walk the id list without a sort
+            posts, serializer_class = list_source(
+                Post.objects.select_related('author').filter(id__in=created_ids).order_by('-id'),
+                PostSerializer
+            )
+            created = serializer_class(posts, many=True, context={'request': request}).data
+        
+        updated = []
+        if updated_ids:
+            updated = list(
+                Post.objects.filter(id__in=updated_ids)
+                .order_by('-id')
+                .values('id', 'likes_count', 'comments_count')
+            )
         
         return Response({
-            'is_liked': is_liked,
-            'likes_count': post.likes.count()
+            'cursor': str(rows[-1][0] if rows else since),
+            'has_more': has_more,
+            'created': created,
+            'updated': updated,
+            'deleted': deleted_ids,
         }, status=status.HTTP_200_OK)
 
 
 class CommentListView(APIView):
     """
-    GET /api/posts/{post_id}/comments/ - Get all comments for a post
+    GET /api/posts/{post_id}/comments/ - Get cursor-paginated comments for a post
     """
     authentication_classes = [CookieAuthentication]
 
@@ -282,10 +694,43 @@ class CommentListView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
+        try:
+            fields = field_selection(request, CommentSerializer)
+        except InvalidFields as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         post = get_object_or_404(Post, id=post_id)
-        comments = Comment.objects.filter(post=post).select_related('author')
-        serializer = CommentSerializer(comments, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        try:
+            page_size = get_page_size(request, 50)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid page_size'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        comments, serializer_class = list_source(
+            Comment.objects.filter(post=post).select_related('author'),
+            CommentSerializer,
+            fields
+        )
+        
+        try:
+            page = KeysetPaginator(comments, page_size, descending=False).page(
+                request.GET.get('cursor') or None,
+                lazy=is_streaming(request)
+            )
+        except InvalidCursor:
+            return Response(
+                {'error': 'Invalid cursor'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return list_response(request, {
+            'next': cursor_link(request, page.next_cursor),
+            'previous': cursor_link(request, page.previous_cursor),
+        }, page.object_list, serializer_class, fields)
 
 
 class CommentCreateView(APIView):
@@ -305,7 +750,11 @@ class CommentCreateView(APIView):
         serializer = CommentCreateSerializer(data=request.data)
         
         if serializer.is_valid():
-            comment = serializer.save(author=request.user, post=post)
+            with transaction.atomic():
+                comment = serializer.save(author=request.user, post=post)
+                Post.adjust_counters(post.id, comments=1)
+                record_change(Change.POST_UPDATED, post.id)
+            bump('posts', post_scope(post.id))
             return Response(
                 CommentSerializer(comment, context={'request': request}).data,
                 status=status.HTTP_201_CREATED
@@ -334,13 +783,17 @@ class CommentDeleteView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        comment.delete()
+        with transaction.atomic():
+            comment.delete()
+            Post.adjust_counters(comment.post_id, comments=-1)
+            record_change(Change.POST_UPDATED, comment.post_id)
+        bump('posts', post_scope(comment.post_id))
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class ProfileDetailView(APIView):
     """
-    GET /api/profile/{id}/ - Get user profile with posts
+    GET /api/profile/{id}/ - Get user profile with the first page of posts
     """
     authentication_classes = [CookieAuthentication]
 
@@ -351,9 +804,72 @@ class ProfileDetailView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
+        try:
+            fields = field_selection(request, ProfileSerializer)
+        except InvalidFields as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        member = get_object_or_404(ProfileSerializer.select_columns(Member.objects.all(), fields), id=id)
+        context = serializer_context(request, fields=fields)
+        if is_selected(fields, 'posts') or is_selected(fields, 'posts_next'):
+            posts = PostSerializer.select_columns(
+                member.posts.all(),
+                ProfileSerializer.posts_selection(fields)
+            )
+            context['posts_page'] = KeysetPaginator(posts, settings.PROFILE_POSTS_PAGE_SIZE).page()
+        serializer = ProfileSerializer(member, context=context)
+        return Response(with_members(serializer.data, context), status=status.HTTP_200_OK)
+
+
+class ProfilePostsView(APIView):
+    """
+    GET /api/profile/{id}/posts/ - Get cursor-paginated posts of a member
+    """
+    authentication_classes = [CookieAuthentication]
+
+    def get(self, request, id):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        try:
+            fields = field_selection(request, PostSerializer)
+        except InvalidFields as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         member = get_object_or_404(Member, id=id)
-        serializer = ProfileSerializer(member, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        try:
+            page_size = get_page_size(request, settings.PROFILE_POSTS_PAGE_SIZE)
+        except ValueError:
+            return Response(
+                {'error': 'Invalid page_size'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        posts, serializer_class = list_source(member.posts.all(), PostSerializer, fields)
+        
+        try:
+            page = KeysetPaginator(posts, page_size).page(
+                request.GET.get('cursor') or None,
+                lazy=is_streaming(request)
+            )
+        except InvalidCursor:
+            return Response(
+                {'error': 'Invalid cursor'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return list_response(request, {
+            'next': cursor_link(request, page.next_cursor),
+            'previous': cursor_link(request, page.previous_cursor),
+        }, page.object_list, serializer_class, fields)
 
 
 class ProfileUpdateView(APIView):
@@ -382,3 +898,167 @@ class ProfileUpdateView(APIView):
                 status=status.HTTP_200_OK
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AvatarUploadView(APIView):
+    """
+    PUT /api/profile/avatar/ - Upload own avatar; the request body is the image
+    """
+    authentication_classes = [CookieAuthentication]
+    # The body is streamed to disk as it arrives and never parsed
+    parser_classes = []
+
+    def put(self, request):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        too_large = Response(
+            {'error': f'Images may be at most {settings.AVATAR_MAX_BYTES} bytes'},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            content_length = 0
+        if content_length > settings.AVATAR_MAX_BYTES:
+            return too_large
+        if request.stream is None:
+            return Response(
+                {'error': 'Empty upload'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            path = store_image(request.stream, 'avatars', settings.AVATAR_MAX_BYTES)
+        except UploadTooLarge:
+            return too_large
+        except InvalidUpload as exc:
+            return Response(
+                {'error': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # avatar_url is a URLField and the profile form sends it back, so
+        # it has to be absolute
+        request.user.avatar_url = request.build_absolute_uri(settings.MEDIA_URL + path)
+        request.user.save(update_fields=['avatar_url'])
+        return Response(
+            MemberSerializer(request.user).data,
+            status=status.HTTP_200_OK
+        )
+
+
+class FollowView(APIView):
+    """
+    POST /api/profile/{id}/follow/ - Follow a member
+    DELETE /api/profile/{id}/follow/ - Unfollow a member
+    """
+    authentication_classes = [CookieAuthentication]
+
+    def post(self, request, id):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        followee = get_object_or_404(Member, id=id)
+        
+        if followee.id == request.user.id:
+            return Response(
+                {'error': 'You cannot follow yourself'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        with transaction.atomic():
+            _, created = Follow.objects.get_or_create(
+                follower=request.user,
+                followee=followee
+            )
+            if created:
+                Member.objects.filter(id=followee.id).update(
+                    followers_count=F('followers_count') + 1
+                )
+                backfill_timeline(request.user, followee)
+        
+        followee.refresh_from_db(fields=['followers_count'])
+        return Response({
+            'is_following': True,
+            'followers_count': followee.followers_count
+        }, status=status.HTTP_200_OK)
+
+    def delete(self, request, id):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        followee = get_object_or_404(Member, id=id)
+        
+        with transaction.atomic():
+            deleted, _ = Follow.objects.filter(
+                follower=request.user,
+                followee=followee
+            ).delete()
+            if deleted:
+                Member.objects.filter(id=followee.id).update(
+                    followers_count=F('followers_count') - 1
+                )
+                purge_timeline(request.user, followee)
+        
+        followee.refresh_from_db(fields=['followers_count'])
+        return Response({
+            'is_following': False,
+            'followers_count': followee.followers_count
+        }, status=status.HTTP_200_OK)
+
+
+class BatchView(APIView):
+    """
+    POST /api/batch/ - Run several GET API requests in one round trip
+
+    Body: {"requests": [{"path": "/api/posts/?page_size=5"}, ...]}. Each
+    sub-request is answered with its own status and body, in order.
+    """
+    authentication_classes = [CookieAuthentication]
+
+    def post(self, request):
+        if not request.user:
+            return Response(
+                {'error': 'Authentication required'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        
+        items = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'error': 'requests must be a non-empty list of GET sub-requests with a path'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > settings.BATCH_MAX_REQUESTS:
+            return Response(
+                {'error': f'At most {settings.BATCH_MAX_REQUESTS} sub-requests are allowed'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        for index, item in enumerate(items):
+            try:
+                validate_subrequest(item)
+            except InvalidSubrequest as exc:
+                return Response(
+                    {'error': f'requests[{index}]: {exc}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        responses = []
+        for item in items:
+            try:
+                sub_status, body = run_subrequest(request, item['path'])
+            except InvalidSubrequest as exc:
+                sub_status, body = status.HTTP_400_BAD_REQUEST, {'error': str(exc)}
+            responses.append({'status': sub_status, 'body': body})
+        
+        return Response({'responses': responses}, status=status.HTTP_200_OK)
@@ -75,8 +75,22 @@ INSTALLED_APPS = [
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "api.views.CookieAuthentication",
+        "api.authentication.CookieAuthentication",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    # Token buckets for the auth endpoints: N/period allows bursts of N and
+    # refills at N per period. Checked before any password is hashed.
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": os.environ.get("LOGIN_IP_RATE", "20/min"),
+        "login_email": os.environ.get("LOGIN_EMAIL_RATE", "5/min"),
+        "register_ip": os.environ.get("REGISTER_IP_RATE", "10/hour"),
+    },
+    # nginx appends the client address to X-Forwarded-For; without this
+    # every client would share the proxy's address and bucket
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", "1")),
 }
 
 # drf-spectacular configuration
@@ -88,6 +102,8 @@ SPECTACULAR_SETTINGS = {
 }
 
 MIDDLEWARE = [
+    "api.middleware.RequestTimingMiddleware",
+    "api.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -120,10 +136,42 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DJANGO_DB_PROFILE selects how SQLite connections are tuned:
+# - "default": stock Django behaviour, a new connection per request
+# - "production": WAL journaling and tuned pragmas applied on every new
+#   connection, persistent connections, a busy timeout instead of immediate
+#   "database is locked" errors, and BEGIN IMMEDIATE for atomic blocks so
+#   writers queue up front instead of failing on lock upgrade
+DB_PROFILE = os.environ.get("DJANGO_DB_PROFILE", "default")
+
+SQLITE_PROFILES = {
+    "default": {
+        "OPTIONS": {},
+    },
+    "production": {
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                "PRAGMA busy_timeout=20000;"
+                "PRAGMA mmap_size=268435456;"
+                "PRAGMA cache_size=-64000;"
+                "PRAGMA temp_store=MEMORY;"
+                "PRAGMA foreign_keys=ON"
+            ),
+        },
+    },
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "persistent" / "db" / "db.sqlite3",
+        **SQLITE_PROFILES[DB_PROFILE],
     }
 }
 
@@ -164,6 +212,104 @@ USE_TZ = True
 
 STATIC_URL = "django_static/"
 
+# Session tokens and authentication
+# Lifetime of the signed session_id cookie, in seconds
+SESSION_TOKEN_MAX_AGE = 60 * 60 * 24 * 14
+# Per-worker LRU cache of authenticated members. Each lookup checks the
+# member's version in the shared cache, which save/delete bump, so changes
+# reach every worker on their next request; entries also expire after the TTL.
+AUTH_MEMBER_CACHE_SIZE = 1024
+AUTH_MEMBER_CACHE_TTL = 60
+
+# Shared cache, visible to every gunicorn worker. Holds the API response
+# cache and its per-scope version tokens.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "persistent" / "cache",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+# Lifetime of a cached API response, in seconds. Writes invalidate entries
+# long before this by bumping the version of the scopes they touch.
+API_RESPONSE_CACHE_TIMEOUT = 300
+
+# Serve post and comment lists from values() rows instead of model
+# serializers; the output is identical (see api/tests.py)
+FAST_LIST_SERIALIZATION = os.environ.get("FAST_LIST_SERIALIZATION", "1") == "1"
+
+# Largest page_size accepted by list endpoints, and when called with stream=1
+MAX_PAGE_SIZE = 100
+STREAMING_MAX_PAGE_SIZE = 10000
+
+# Number of posts embedded in the profile response; the rest are paginated
+PROFILE_POSTS_PAGE_SIZE = 20
+
+# Home timeline
+# Authors with more followers than this are not fanned out on write; their
+# posts are merged into follower feeds at read time instead.
+TIMELINE_FANOUT_LIMIT = int(os.environ.get("TIMELINE_FANOUT_LIMIT", 5000))
+# Number of recent posts copied into a timeline when following someone
+TIMELINE_BACKFILL_SIZE = 50
+
+# Route the read-heavy views (me, post list/detail, comments, profile) to
+# their async versions. Enable together with the ASGI entry point
+# (config.asgi); under WSGI every async view pays for its own event loop.
+ASYNC_READ_VIEWS = os.environ.get("DJANGO_ASYNC_VIEWS") == "1"
+
+# Request timing (api.middleware.RequestTimingMiddleware). The fraction of
+# requests whose SQL is timed for the Server-Timing header, and the duration
+# above which a request is logged with its slowest statements.
+REQUEST_TIMING_SAMPLE_RATE = float(os.environ.get("REQUEST_TIMING_SAMPLE_RATE", 0.1))
+SLOW_REQUEST_MS = int(os.environ.get("SLOW_REQUEST_MS", 500))
+SLOW_REQUEST_TOP_QUERIES = 5
+
+# Per-view request metrics, aggregated across gunicorn workers through one
+# memory-mapped file per process in METRICS_DIR and served at /metrics
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+METRICS_DIR = os.environ.get("METRICS_DIR", BASE_DIR / "persistent" / "metrics")
+
+# Largest number of sub-requests accepted by /api/batch/
+BATCH_MAX_REQUESTS = 20
+
+# Password hashing runs on a bounded per-process pool so login and
+# registration bursts cannot take every request thread; requests beyond
+# WORKERS running plus QUEUE waiting get a 503. Set WORKERS to 0 to hash inline.
+PASSWORD_HASHING_WORKERS = int(os.environ.get("PASSWORD_HASHING_WORKERS", "2"))
+PASSWORD_HASHING_QUEUE = int(os.environ.get("PASSWORD_HASHING_QUEUE", "8"))
+
+# Database job queue (api.jobs) drained by `manage.py run_jobs`. A claimed
+# job is leased for JOB_LEASE_SECONDS; failures are retried up to
+# JOB_MAX_ATTEMPTS times with exponential backoff. JOB_QUEUE_INLINE runs
+# tasks in-process after commit instead, for development without a worker.
+JOB_QUEUE_INLINE = os.environ.get("JOB_QUEUE_INLINE", "0") == "1"
+JOB_LEASE_SECONDS = 300
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BASE_DELAY = 10
+JOB_RETRY_MAX_DELAY = 3600
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", "1.0"))
+
+# Periodic tasks the job worker enqueues, as {task name: interval in seconds}
+JOB_SCHEDULE = {
+    "purge_change_log": 3600,
+}
+
+# Change feed at /api/changes/: entries returned per response, the longest
+# a long poll may wait and how often it re-reads the log while waiting, and
+# how many entries the log keeps (clients further behind get a 410). Long
+# polls are only held by the async view (DJANGO_ASYNC_VIEWS=1); under WSGI
+# they would tie up request threads, so wait is ignored there
+CHANGES_PAGE_SIZE = 500
+CHANGES_MAX_WAIT = 25
+CHANGES_POLL_INTERVAL = 1.0
+CHANGE_LOG_MAX_ENTRIES = 100000
+
+# Uploads are streamed to disk in chunks of UPLOAD_CHUNK_SIZE bytes. Keep
+# AVATAR_MAX_BYTES in step with client_max_body_size for the avatar
+# location in nginx/django-api.conf.
+UPLOAD_CHUNK_SIZE = 64 * 1024
+AVATAR_MAX_BYTES = 2 * 1024 * 1024
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
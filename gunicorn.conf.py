@@ -1,11 +1,22 @@
 """Gunicorn configuration for Docker deployment"""
 
+import os
+
 # Server socket - bind to different port for nginx upstream
 bind = "127.0.0.1:8001"
 
+# Application. The default serves WSGI with gthread workers, so each worker
+# handles `threads` requests at once instead of one. To serve ASGI with the
+# async read views, install an ASGI worker and set e.g.
+#   GUNICORN_APP=config.asgi:application
+#   GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker
+#   DJANGO_ASYNC_VIEWS=1
+wsgi_app = os.environ.get("GUNICORN_APP", "config.wsgi:application")
+
 # Worker processes
-workers = 2
-worker_class = "sync"
+workers = int(os.environ.get("GUNICORN_WORKERS", 2))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
 worker_connections = 1000
 max_requests = 10000
 max_requests_jitter = 1000
@@ -0,0 +1,13 @@
+import instance from './axios';
+
+/**
+ * Run several GET API requests in one round trip
+ * @param {string[]} paths - API paths with optional query strings, e.g. '/api/posts/?page_size=5' (at most 20)
+ * @returns {Promise} Array of { status, body }, one per path, in the same order
+ */
+export const batchGet = async (paths) => {
+  const response = await instance.post('/api/batch/', {
+    requests: paths.map((path) => ({ path })),
+  });
+  return response.data.responses;
+};
@@ -1,13 +1,20 @@
 import instance from './axios';
+import { cursorFromLink } from './cursor';
 
 /**
- * Get all comments for a specific post
+ * Get a page of comments for a specific post, oldest first
  * @param {number} postId - Post ID
- * @returns {Promise} Response with list of comments
+ * @param {string} cursor - Cursor from a previous page (optional)
+ * @returns {Promise} { results, next }: the comments and the cursor of the next page (null on the last page)
  */
-export const getComments = async (postId) => {
-  const response = await instance.get(`/api/posts/${postId}/comments/`);
-  return response.data;
+export const getComments = async (postId, cursor) => {
+  const response = await instance.get(`/api/posts/${postId}/comments/`, {
+    params: cursor ? { cursor } : {},
+  });
+  return {
+    results: response.data.results,
+    next: cursorFromLink(response.data.next),
+  };
 };
 
 /**
@@ -0,0 +1,11 @@
+/**
+ * Extract the cursor from a `next`/`previous` link of a paginated response
+ * @param {string|null} link - Link such as '/api/posts/1/comments/?cursor=abc'
+ * @returns {string|null} Cursor to pass to the next request, or null when there is no page
+ */
+export const cursorFromLink = (link) => {
+  if (!link) {
+    return null;
+  }
+  return new URL(link, window.location.origin).searchParams.get('cursor');
+};
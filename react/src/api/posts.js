@@ -56,3 +56,33 @@ export const toggleLike = async (id) => {
   const response = await instance.post(`/api/posts/${id}/like/`);
   return response.data;
 };
+
+/**
+ * Get like status and like counts for many posts in one request
+ * @param {number[]} ids - Post IDs (at most 100)
+ * @returns {Promise} Response with { id, is_liked, likes_count } per known post
+ */
+export const getLikeStates = async (ids) => {
+  const response = await instance.get('/api/posts/likes/state/', {
+    params: {
+      ids: ids.join(','),
+    },
+  });
+  return response.data.results;
+};
+
+/**
+ * Get post feed changes since a cursor, waiting up to `wait` seconds for one
+ * @param {string} [since] - Cursor from the previous call; omit to get a starting cursor
+ * @param {number} [wait] - Seconds to long-poll when nothing has changed yet (at most 25; ignored unless the API runs async views)
+ * @returns {Promise} Response with { cursor, has_more, created, updated, deleted }
+ */
+export const getChanges = async (since, wait = 0) => {
+  const response = await instance.get('/api/changes/', {
+    params: {
+      since,
+      wait,
+    },
+  });
+  return response.data;
+};
@@ -1,15 +1,32 @@
 import instance from './axios';
+import { cursorFromLink } from './cursor';
 
 /**
  * Get user profile by ID
  * @param {number} id - User ID
- * @returns {Promise} Response with user profile and posts
+ * @returns {Promise} Response with user profile and the first page of posts (`posts_next` links the rest)
  */
 export const getProfile = async (id) => {
   const response = await instance.get(`/api/profile/${id}/`);
   return response.data;
 };
 
+/**
+ * Get a page of a user's posts, newest first
+ * @param {number} id - User ID
+ * @param {string} cursor - Cursor from a previous page (optional)
+ * @returns {Promise} { results, next }: the posts and the cursor of the next page (null on the last page)
+ */
+export const getProfilePosts = async (id, cursor) => {
+  const response = await instance.get(`/api/profile/${id}/posts/`, {
+    params: cursor ? { cursor } : {},
+  });
+  return {
+    results: response.data.results,
+    next: cursorFromLink(response.data.next),
+  };
+};
+
 /**
  * Update current user's profile
  * @param {Object} data - Profile data to update
@@ -23,3 +40,17 @@ export const updateProfile = async (data) => {
   const response = await instance.patch('/api/profile/', data);
   return response.data;
 };
+
+/**
+ * Upload an avatar image for the current user
+ * @param {File|Blob} file - PNG, JPEG, GIF or WebP image, at most 2 MiB
+ * @returns {Promise} Response with updated profile
+ */
+export const uploadAvatar = async (file) => {
+  const response = await instance.put('/api/profile/avatar/', file, {
+    headers: {
+      'Content-Type': file.type || 'application/octet-stream',
+    },
+  });
+  return response.data;
+};
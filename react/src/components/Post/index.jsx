@@ -9,6 +9,8 @@ const Post = ({ post, currentUser, onDelete, onUpdate }) => {
   const [showComments, setShowComments] = useState(false);
   const [comments, setComments] = useState([]);
   const [loadingComments, setLoadingComments] = useState(false);
+  const [commentsNext, setCommentsNext] = useState(null);
+  const [loadingMoreComments, setLoadingMoreComments] = useState(false);
   const [isLiked, setIsLiked] = useState(post.is_liked);
   const [likesCount, setLikesCount] = useState(post.likes_count);
   const [commentsCount, setCommentsCount] = useState(post.comments_count);
@@ -86,7 +88,8 @@ const Post = ({ post, currentUser, onDelete, onUpdate }) => {
       setLoadingComments(true);
       try {
         const commentsData = await getComments(post.id);
-        setComments(commentsData);
+        setComments(commentsData.results);
+        setCommentsNext(commentsData.next);
       } catch (err) {
         console.error('Failed to load comments:', err);
       } finally {
@@ -96,6 +99,19 @@ const Post = ({ post, currentUser, onDelete, onUpdate }) => {
     setShowComments(!showComments);
   };
 
+  const handleLoadMoreComments = async () => {
+    setLoadingMoreComments(true);
+    try {
+      const commentsData = await getComments(post.id, commentsNext);
+      setComments(prev => [...prev, ...commentsData.results]);
+      setCommentsNext(commentsData.next);
+    } catch (err) {
+      console.error('Failed to load more comments:', err);
+    } finally {
+      setLoadingMoreComments(false);
+    }
+  };
+
   const handleCommentCreated = (newComment) => {
     setComments(prev => [...prev, newComment]);
     setCommentsCount(prev => prev + 1);
@@ -193,6 +209,15 @@ const Post = ({ post, currentUser, onDelete, onUpdate }) => {
                   ))
                 )}
               </div>
+              {commentsNext && (
+                <button
+                  className="comments-load-more"
+                  onClick={handleLoadMoreComments}
+                  disabled={loadingMoreComments}
+                >
+                  {loadingMoreComments ? 'Загрузка...' : 'Показать ещё комментарии'}
+                </button>
+              )}
               <Comment
                 postId={post.id}
                 currentUser={currentUser}
@@ -1,8 +1,9 @@
 import React, { useState, useEffect } from 'react';
 import { useParams } from 'react-router-dom';
 import { useAuth } from '../../context/AuthContext';
-import { getProfile } from '../../api/profile';
+import { getProfile, getProfilePosts } from '../../api/profile';
 import Post from '../../components/Post';
+import { cursorFromLink } from '../../api/cursor';
 import EditProfileModal from '../../components/EditProfileModal';
 import './Profile.css';
 
@@ -11,6 +12,8 @@ const Profile = () => {
   const { user: currentUser } = useAuth();
   const [profile, setProfile] = useState(null);
   const [posts, setPosts] = useState([]);
+  const [postsNext, setPostsNext] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [showEditModal, setShowEditModal] = useState(false);
@@ -28,6 +31,7 @@ const Profile = () => {
       const data = await getProfile(id);
       setProfile(data);
       setPosts(data.posts || []);
+      setPostsNext(cursorFromLink(data.posts_next));
     } catch (err) {
       console.error('Failed to load profile:', err);
       setError('Не удалось загрузить профиль');
@@ -36,6 +40,19 @@ const Profile = () => {
     }
   };
 
+  const handleLoadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const data = await getProfilePosts(id, postsNext);
+      setPosts(prev => [...prev, ...data.results]);
+      setPostsNext(data.next);
+    } catch (err) {
+      console.error('Failed to load posts:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const getInitials = (firstName, lastName, username) => {
     if (firstName && lastName) {
       return `${firstName[0]}${lastName[0]}`.toUpperCase();
@@ -135,7 +152,6 @@ const Profile = () => {
       <div className="profile-content">
         <div className="profile-section-title">
           <h2>Посты</h2>
-          <span className="profile-posts-count">{posts.length}</span>
         </div>
         {posts.length === 0 ? (
           <div className="profile-no-posts">
@@ -163,6 +179,17 @@ const Profile = () => {
             ))}
           </div>
         )}
+        {postsNext && (
+          <div className="profile-load-more-section">
+            <button
+              className="profile-load-more-button"
+              onClick={handleLoadMore}
+              disabled={loadingMore}
+            >
+              {loadingMore ? 'Загрузка...' : 'Загрузить ещё'}
+            </button>
+          </div>
+        )}
       </div>
 
       {showEditModal && (